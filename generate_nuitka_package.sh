@@ -1,2 +1,2 @@
 # for linux:
-(cd lyrical; python -m nuitka --standalone --onefile --include-data-file=literary_resources/*.json=./literary_resources/ --include-data-file=resources/*.gz=./spellchecker/resources/  --enable-plugin=pyqt5 --enable-plugin=anti-bloat lyrical.py)
+(cd lyrical; python compileDictionaries.py && python -m nuitka --standalone --onefile --include-data-file=literary_resources/*.json=./literary_resources/ --include-data-file=resources/*.gz=./spellchecker/resources/ --include-data-file=databases/*.lexicon=./databases/ --include-data-file=databases/thesaurus.db=./databases/ --include-data-file=databases/wordnet.index=./databases/ --enable-plugin=pyqt5 --enable-plugin=anti-bloat lyrical.py)
@@ -1 +1 @@
-python.exe -m PyInstaller lyrical.spec
\ No newline at end of file
+python.exe compileDictionaries.py && python.exe -m PyInstaller lyrical.spec
\ No newline at end of file
@@ -1 +1 @@
-python -m PyInstaller lyrical.spec
\ No newline at end of file
+python compileDictionaries.py && python -m PyInstaller lyrical.spec
\ No newline at end of file
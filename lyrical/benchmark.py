@@ -0,0 +1,323 @@
+import os
+# the benchmarks never show a window, this must be set before Qt is imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from types import SimpleNamespace
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import logging
+
+from PyQt5.QtCore import Qt, QEventLoop, QModelIndex, QRegExp, QT_VERSION_STR
+from PyQt5.QtGui import QStandardItemModel, QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+# Benchmarks for the text analysis hot paths, run against a synthetic manuscript so results
+# are repeatable. Each benchmark reports its timings and peak Python memory, the results can be
+# saved as a baseline and later runs compared against it to catch regressions between releases.
+#
+#   python benchmark.py                                   run everything
+#   python benchmark.py --paragraphs 5000 --save-baseline  record a baseline for a larger manuscript
+#   python benchmark.py --compare                         fail if anything is slower than the baseline
+#   python benchmark.py --only spelling                   run the benchmarks whose names start with spelling
+
+BENCHMARK_BASELINE = "./benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.25  # fraction a benchmark may slow down by before it counts as a regression
+MISSPELLING_RATE = 0.03
+# Fixed so manuscripts of a given size are the same from one release to the next
+VOCABULARY = """
+the of and to a in was he that it his her you as had with for she not at but be my on have him
+is said me which by so this all from they no were if would or when what there been one could
+very an who them do we now more out up into their then some your about time man like any only
+over old can see upon made before know after well two down back little should through must
+night light morning window garden river house mother father letter voice silence shadow
+remember thought looked turned whispered walked waited wondered believed answered smiled
+across against beneath beyond toward without between behind quietly slowly suddenly gently
+beautiful strange familiar distant ancient broken golden silver bitter tender restless
+summer winter autumn evening darkness sunlight harbour mountain meadow village stranger
+""".split()
+
+
+class BenchmarkContext:
+    # the synthetic manuscript and the objects the benchmarks share
+
+    def __init__(self, arguments):
+        self.arguments = arguments
+        generator = random.Random(arguments.seed)
+        self.paragraphs = []
+        self.misspelled = []
+        for _ in range(arguments.paragraphs):
+            words = []
+            for _ in range(arguments.words):
+                word = generator.choice(VOCABULARY)
+                if generator.random() < MISSPELLING_RATE and len(word) > 3:
+                    position = generator.randrange(len(word) - 1)
+                    # transpose two letters, the most common typing mistake
+                    word = word[:position] + word[position + 1] + \
+                        word[position] + word[position + 2:]
+                    self.misspelled.append(word)
+                words.append(word)
+            sentence = " ".join(words)
+            self.paragraphs.append(sentence[0].upper() + sentence[1:] + ".")
+        self.text = "\n".join(self.paragraphs)
+        self.words = self.text.split()
+        self._speller = None
+        self.application = QApplication.instance() or QApplication(sys.argv)
+        # Qt deletes a highlighter with its document, so the documents are kept here until the end
+        self.documents = []
+        # run once every benchmark has finished, e.g. to stop worker threads
+        self.cleanups = []
+
+    @property
+    def speller(self):
+        if self._speller is None:
+            from spellCheckWord import SpellCheckWord
+            self._speller = SpellCheckWord(
+                [], lambda word: None, "en", self.arguments.resources)
+        return self._speller
+
+
+def measure(name: str, operation, items: int, repeat: int) -> dict:
+    """
+    Time an operation and record its peak memory
+    :param operation: a callable doing the work once, it may return a cleanup callable run outside the timing
+    :param items: the number of units of work (words, paragraphs, rows) one call processes
+    :return: the result record stored in the report and the baseline
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cleanup = operation()
+        timings.append(time.perf_counter() - start)
+        if callable(cleanup):
+            cleanup()
+    # a separate traced run, tracing slows everything down so it is not part of the timings
+    tracemalloc.start()
+    cleanup = operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if callable(cleanup):
+        cleanup()
+    return {"name": name, "items": items, "repeat": repeat,
+            "min": min(timings), "mean": sum(timings) / len(timings), "max": max(timings),
+            "perItem": min(timings) / max(items, 1), "peakMemory": peak}
+
+
+def benchmarkSpellingCheck(context):
+    speller = context.speller
+    words = context.words
+    return len(words), lambda: [speller.check(word) for word in words]
+
+
+def benchmarkSpellingRanges(context):
+    speller = context.speller
+    return len(context.paragraphs), lambda: [speller.misspelledRanges(paragraph) for paragraph in context.paragraphs]
+
+
+def benchmarkSpellingSuggestions(context):
+    speller = context.speller
+    words = context.misspelled[:200]
+    return len(words), lambda: [speller.suggestions(word) for word in words]
+
+
+def benchmarkHighlighter(context, warm: bool):
+    from highlighter import Highlighter
+    document = QTextDocument()
+    context.documents.append(document)
+    highlighter = Highlighter(document)
+    highlighter.setSpeller(context.speller)
+    document.setPlainText(context.text)
+
+    def waitForChecks():
+        while highlighter.pendingChecks:
+            context.application.processEvents(QEventLoop.AllEvents, 50)
+
+    waitForChecks()
+
+    def highlight():
+        if not warm:
+            highlighter.spellingCache.clear()
+        highlighter.rehighlight()
+        waitForChecks()
+
+    context.cleanups.append(highlighter.shutdown)
+    return document.blockCount(), highlight
+
+
+def benchmarkAverageSyllables(context):
+    import style
+    text = "\n".join(context.paragraphs[:context.arguments.style_paragraphs])
+    return len(text.split()), lambda: style.calculate_average_syllables_per_word(text)
+
+
+def benchmarkEchoes(context):
+    import style
+    return len(context.words), lambda: style.findEchoes(context.text)
+
+
+def benchmarkLint(context):
+    from lintCheck import LintCheck
+    lintCheck = LintCheck()
+    document = QTextDocument()
+    document.setPlainText(
+        "\n".join(context.paragraphs[:context.arguments.lint_paragraphs]))
+
+    def lint():
+        block = document.begin()
+        while block.isValid():
+            lintCheck.checkSection(block, block.blockNumber())
+            block = block.next()
+
+    return document.blockCount(), lint
+
+
+def benchmarkFilter(context):
+    from sortBeautifulWordsFilterProxyModel import SortBeautifulWordsFilterProxyModel
+    rows = context.arguments.rows
+    generator = random.Random(context.arguments.seed)
+    model = QStandardItemModel(rows, 4)
+    for row in range(rows):
+        for column in range(4):
+            model.setData(model.index(row, column, QModelIndex()), " ".join(
+                generator.choice(VOCABULARY) for _ in range(1 + column * 3)), Qt.DisplayRole)
+    # stands in for the selector dialog, the proxy reads the filter settings from it
+    filters = SimpleNamespace(wordFilterEnabled=True, wordFilterPattern="^s",
+                              meaningFilterEnabled=True, meaningFilterPattern="light",
+                              tagFilterEnabled=False, tagFilterPattern="",
+                              classificationFilterEnabled=False, classificationFilterPattern="")
+    proxyModel = SortBeautifulWordsFilterProxyModel(filters)
+    proxyModel.setSourceModel(model)
+
+    def applyFilter():
+        proxyModel.setFilterRegExp(QRegExp("^s", Qt.CaseInsensitive))
+        proxyModel.invalidateFilter()
+        proxyModel.rowCount()
+        # let the next run filter again from scratch
+        return lambda: proxyModel.setFilterRegExp(QRegExp())
+
+    return rows, applyFilter
+
+
+BENCHMARKS = {
+    "spelling.check": benchmarkSpellingCheck,
+    "spelling.misspelledRanges": benchmarkSpellingRanges,
+    "spelling.suggestions": benchmarkSpellingSuggestions,
+    "highlighter.cold": lambda context: benchmarkHighlighter(context, False),
+    "highlighter.warm": lambda context: benchmarkHighlighter(context, True),
+    "style.averageSyllables": benchmarkAverageSyllables,
+    "style.findEchoes": benchmarkEchoes,
+    "lint.checkSection": benchmarkLint,
+    "filter.beautifulWords": benchmarkFilter,
+}
+
+
+def loadBaseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def saveBaseline(path: str, configuration: dict, results: list[dict]):
+    baseline = {"python": platform.python_version(), "qt": QT_VERSION_STR,
+                "platform": platform.platform(), "configuration": configuration,
+                "results": {result["name"]: result for result in results}}
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+    os.replace(temporaryPath, path)
+
+
+def report(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    previousResults = baseline.get("results", {})
+    print("{:<28}{:>9}{:>12}{:>12}{:>14}{:>12}{:>10}".format(
+        "benchmark", "items", "min ms", "mean ms", "per item us", "peak KiB", "change"))
+    for result in results:
+        change = ""
+        previous = previousResults.get(result["name"])
+        if previous and previous["items"] == result["items"]:
+            ratio = result["min"] / previous["min"] - 1
+            change = "{:+.0%}".format(ratio)
+            if ratio > tolerance:
+                regressions.append(result["name"])
+                change += " !"
+        print("{:<28}{:>9}{:>12.2f}{:>12.2f}{:>14.2f}{:>12.0f}{:>10}".format(
+            result["name"], result["items"], result["min"] * 1000, result["mean"] * 1000,
+            result["perItem"] * 1000000, result["peakMemory"] / 1024, change))
+    return regressions
+
+
+def createParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the editor's text analysis")
+    parser.add_argument("--paragraphs", type=int, default=2000,
+                        help="the number of paragraphs in the synthetic manuscript")
+    parser.add_argument("--words", type=int, default=60,
+                        help="the number of words in each paragraph")
+    parser.add_argument("--rows", type=int, default=5000,
+                        help="the number of rows in the filtered word list")
+    parser.add_argument("--style-paragraphs", type=int, default=100,
+                        help="the paragraphs used for the (slow) syllable count")
+    parser.add_argument("--lint-paragraphs", type=int, default=20,
+                        help="the paragraphs used for the (slow) proselint checks")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="the number of timed runs of each benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="only run benchmarks whose names start with these prefixes")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE,
+                        help="the baseline file to compare against or save to")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="exit with status 1 if a benchmark regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="the slow down allowed before a benchmark counts as a regression")
+    parser.add_argument("--resources", default="",
+                        help="the directory containing the spellchecker resources")
+    return parser
+
+
+def main():
+    arguments = createParser().parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    context = BenchmarkContext(arguments)
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if arguments.only and not any(name.startswith(prefix) for prefix in arguments.only):
+            continue
+        try:
+            items, operation = benchmark(context)
+        except ImportError as error:
+            # nltk, proselint and language_tool_python are optional for the benchmarks
+            print("{}: skipped, {}".format(name, error))
+            continue
+        results.append(measure(name, operation, items, arguments.repeat))
+    for cleanup in context.cleanups:
+        cleanup()
+
+    configuration = {key: value for key, value in vars(arguments).items()
+                     if key in ("paragraphs", "words", "rows", "style_paragraphs", "lint_paragraphs", "seed")}
+    baseline = loadBaseline(arguments.baseline)
+    if baseline and baseline.get("configuration") != configuration:
+        print("The baseline was recorded with a different configuration, not comparing")
+        baseline = {}
+    regressions = report(results, baseline, arguments.tolerance)
+    if arguments.save_baseline:
+        saveBaseline(arguments.baseline, configuration, results)
+        print("Saved the baseline to {}".format(arguments.baseline))
+    if regressions:
+        print("Slower than the baseline: {}".format(", ".join(regressions)))
+        if arguments.compare:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import argparse
+import os
+import logging
+
+import compiledDictionary
+import symmetricDelete
+import wordnetIndex
+
+# Build step: compiles the bundled frequency lists (and optionally a personal word list) into the
+# memory mapped indexes used by SpellCheckWord. Run it from the lyrical directory before packaging.
+#
+#   python compileDictionaries.py                 compile every bundled language
+#   python compileDictionaries.py en de           compile selected languages
+#   python compileDictionaries.py en --personal local_dictionary.txt
+#
+# It also exports the WordNet synonyms and parts of speech used by ThesaurusWordnet, which needs the
+# NLTK wordnet corpus to be installed (python -m nltk.downloader wordnet).
+
+
+def readWordList(path: str) -> list[str]:
+    if path is None or not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile spelling dictionaries into memory mapped indexes")
+    parser.add_argument("languages", nargs="*",
+                        help="languages to compile, defaults to every bundled language")
+    parser.add_argument("--personal", default=None,
+                        help="a personal word list to compile into the indexes")
+    parser.add_argument("--max-distance", type=int, default=symmetricDelete.DEFAULT_MAX_DISTANCE,
+                        help="the largest edit distance suggestions can be found for")
+    parser.add_argument("--resources", default="",
+                        help="the directory containing the spellchecker resources")
+    parser.add_argument("--no-wordnet", action="store_true",
+                        help="do not export the WordNet index")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    personalWords = readWordList(arguments.personal)
+    for language in arguments.languages or compiledDictionary.availableLanguages(arguments.resources):
+        count = compiledDictionary.compileDictionary(
+            [compiledDictionary.sourcePath(language, arguments.resources)],
+            compiledDictionary.compiledPath(language, arguments.resources),
+            personalWords, arguments.max_distance)
+        print("Compiled {} words for '{}'".format(count, language))
+    if not arguments.no_wordnet:
+        count = wordnetIndex.buildWordnetIndex(
+            wordnetIndex.wordnetIndexPath(arguments.resources))
+        print("Exported {} WordNet lemmas".format(count))
+
+
+if __name__ == '__main__':
+    main()
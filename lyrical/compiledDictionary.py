@@ -0,0 +1,106 @@
+from array import array
+import glob
+import gzip
+import json
+import os
+import logging
+
+from mmapIndex import MmapIndex, IndexFormatError, packStrings, writeIndex
+import symmetricDelete
+
+# The frequency lists shipped with pyspellchecker are compiled into a sorted, memory mapped index
+# so the spell checker can start without decompressing and parsing them.
+DICTIONARY_SOURCES = "spellchecker/resources"
+COMPILED_DICTIONARIES = "databases"
+COMPILED_EXTENSION = ".lexicon"
+MAXIMUM_FREQUENCY = 0xFFFFFFFF
+
+
+def sourcePath(language: str, resourcePath: str = "") -> str:
+    return os.path.join(resourcePath, DICTIONARY_SOURCES, "{}.json.gz".format(language))
+
+
+def compiledPath(language: str, resourcePath: str = "") -> str:
+    return os.path.join(resourcePath, COMPILED_DICTIONARIES, "{}{}".format(language, COMPILED_EXTENSION))
+
+
+def availableLanguages(resourcePath: str = "") -> list[str]:
+    pattern = os.path.join(resourcePath, DICTIONARY_SOURCES, "*.json.gz")
+    return sorted(os.path.basename(path)[:-len(".json.gz")] for path in glob.glob(pattern))
+
+
+def loadFrequencies(sources: list[str], personalWords=()) -> dict[str, int]:
+    frequencies = {}
+    for source in sources:
+        with gzip.open(source, "rt", encoding="utf-8") as file:
+            for word, count in json.load(file).items():
+                word = word.lower()
+                frequencies[word] = frequencies.get(word, 0) + int(count)
+    for word in personalWords:
+        word = word.strip().lower()
+        if word:
+            frequencies[word] = frequencies.get(word, 0) + 1
+    return frequencies
+
+
+def compileDictionary(sources: list[str], target: str, personalWords=(),
+                      maxDistance: int = symmetricDelete.DEFAULT_MAX_DISTANCE) -> int:
+    frequencies = loadFrequencies(sources, personalWords)
+    words = sorted(frequencies)
+    counts = array("I", (min(frequencies[word], MAXIMUM_FREQUENCY)
+                   for word in words))
+    sections = {"words": packStrings(words), "frequencies": counts.tobytes()}
+    # the symmetric delete index used for suggestions is stored alongside the words
+    sections.update(symmetricDelete.buildDeleteIndex(words, maxDistance))
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    writeIndex(target, sections)
+    logging.info("compiledDictionary: compiled {} words into {}".format(
+        len(words), target))
+    return len(words)
+
+
+def isStale(language: str, resourcePath: str = "") -> bool:
+    target = compiledPath(language, resourcePath)
+    if not os.path.exists(target):
+        return True
+    source = sourcePath(language, resourcePath)
+    return os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(target)
+
+
+def openDictionary(language: str = "en", resourcePath: str = "") -> "CompiledDictionary":
+    # The build step normally provides the index, we only compile here if it is missing or out of date
+    target = compiledPath(language, resourcePath)
+    if isStale(language, resourcePath):
+        logging.warning(
+            "compiledDictionary: no current index for '{}', compiling {}".format(language, target))
+        compileDictionary([sourcePath(language, resourcePath)], target)
+    try:
+        return CompiledDictionary(target)
+    except IndexFormatError as error:
+        logging.warning("compiledDictionary: {}, recompiling".format(error))
+        compileDictionary([sourcePath(language, resourcePath)], target)
+        return CompiledDictionary(target)
+
+
+class CompiledDictionary:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index = MmapIndex(path)
+        if not self.index.hasSection("deletes"):
+            raise IndexFormatError(
+                "{} has no suggestion index".format(path))
+        self.words = self.index.strings("words")
+        self.frequencies = self.index.integers("frequencies")
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return self.words.find(word) >= 0
+
+    def frequency(self, word: str) -> int:
+        position = self.words.find(word)
+        if position < 0:
+            return 0
+        return self.frequencies[position]
@@ -9,57 +9,89 @@ import logging
 BASE_URL = "https://describingwords.io/for/"
 TARGET_TAG_REGEX='<script type="text\/json" id="preloadedDataEl">.*?</script>'
 TARGET_TAG_STRING='<script type="text/json" id="preloadedDataEl">'
+END_TAG_STRING = '</script>'
+DESCRIBE_TIMEOUT = 5  # seconds
 
 class DescribeWord():
-    def __init__(self,number=20):
+    def __init__(self,number=20, cache=None, timeout=DESCRIBE_TIMEOUT):
         self.word = ""
         self.descriptions = []
         self.json_object = {}
         self.numberOfDescriptions = number
-        self.recordName = ""
         self.topTen = []
+        # an optional ResponseCache, descriptions are stored per lower cased word
+        self.cache = cache
+        self.timeout = timeout
 
 
     def parsePage(self,html):
         pattern = TARGET_TAG_REGEX
-        match_results = re.search(pattern, html, re.IGNORECASE)
+        match_results = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
         json_string = match_results.group()
         json_string = re.sub("<.*?>", "", json_string) # Remove HTML tags
-        # print(json_string)
-        # f = open("sky.json", "a")
-        # f.write(json_string)
-        # f.close()
         self.json_object = json.loads(json_string)
         self.json_object["terms"].sort(key=lambda x: x["score"],reverse = True)
-        # print(self.json_object)
+        descriptions = []
         for index, element in enumerate(self.json_object["terms"]):
-            self.topTen.append(element["word"])
+            descriptions.append(element["word"])
             if index == self.numberOfDescriptions:
                 break
+        return descriptions
 
-        with open(self.recordName, 'w') as file:
-            json.dump(self.json_object, file)
-            
-            
-    def getData(self):
+
+    def fetchPage(self, word):
+        # We read the page a line at a time and stop as soon as the script holding the data has been seen
+        url = "{}{}".format(BASE_URL, request.quote(word))
+        request_site = Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        collected = []
+        with urlopen(request_site, timeout=self.timeout) as response:
+            for line in response:
+                line = line.decode("utf-8", errors="replace")
+                if not collected:
+                    start = line.find(TARGET_TAG_STRING)
+                    if start < 0:
+                        continue
+                    line = line[start:]
+                collected.append(line)
+                if END_TAG_STRING in line:
+                    break
+        return "".join(collected)
+
+
+    def lookup(self, word: str) -> list[str]:
+        # raises OSError (URLError, timeouts) when the site cannot be reached
+        html = self.fetchPage(word)
+        if not html:
+            logging.debug("describeWord: no descriptions found for {}".format(word))
+            return []
+        try:
+            return self.parsePage(html)
+        except (AttributeError, KeyError, ValueError) as e:
+            logging.error("Could not resolve description for {}: {}".format(word, e))
+            return []
+
+
+    def describe(self, word: str) -> list[str]:
+        # read through the cache, safe to call from the lookup workers
+        key = word.lower()
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is not None and entry[1]:
+            return list(entry[0])
         try:
-            url = "{}{}".format(BASE_URL,self.word)
-            self.recordName = "Samples/{}.json".format(self.word)
-            request_site = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            webpage = urlopen(request_site).read()
-            # print(webpage[:500])
-            html = webpage.decode("utf-8")
-            target_string=TARGET_TAG_STRING
-            for line in html.split('\n'):
-                if target_string in line:
-                    # print("Identified:" +  line)
-                    self.parsePage(line)  
-        except Exception as e:
-            logging.error("Could not resolve description for {}".format(self.word))
-            
-            
+            descriptions = self.lookup(word)
+        except OSError as e:
+            logging.error("Could not resolve description for {}: {}".format(word, e))
+            # offline, use what we had even if it is old
+            return list(entry[0]) if entry is not None else []
+        if self.cache is not None:
+            self.cache.put(key, descriptions)
+        return descriptions
+
+
     def suggestions(self, word: str) -> list[str]:
-        self.topTen.clear()
+        # blocks on the network if the word is not cached, call it from a worker
+        if word is None:
+            return []
         self.word = word
-        self.getData()
-        return self.topTen
\ No newline at end of file
+        self.topTen = self.describe(word)
+        return self.topTen
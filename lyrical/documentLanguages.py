@@ -0,0 +1,66 @@
+import json
+import os
+import re
+import logging
+import globals
+
+# the language chosen for each document of a project, keyed by the path relative to the project
+DOCUMENT_LANGUAGES = os.path.join(
+    globals.PROJECT_DATA_DIRECTORY, "languages.json")
+HTML_LANGUAGE_REGEX = re.compile(
+    r"<html[^>]*\blang=[\"']([A-Za-z]{2})", re.IGNORECASE)
+
+
+# Returns the two letter language declared by an html document, if it declares one
+def detectLanguage(text: str) -> str:
+    match = HTML_LANGUAGE_REGEX.search(text[:2000])
+    if match:
+        return match.group(1).lower()
+    return ""
+
+
+class DocumentLanguages:
+
+    def __init__(self, projectDirectory: str = None):
+        self.languages = {}
+        self.projectDirectory = None
+        self.setProjectDirectory(projectDirectory)
+
+    def setProjectDirectory(self, projectDirectory: str):
+        self.projectDirectory = projectDirectory
+        self.languages = {}
+        if projectDirectory and os.path.exists(self.path()):
+            try:
+                with open(self.path(), "r", encoding="utf-8") as f:
+                    self.languages = json.load(f)
+            except (OSError, ValueError) as error:
+                logging.error(
+                    "documentLanguages: could not read {}: {}".format(self.path(), error))
+
+    def path(self) -> str:
+        return os.path.join(self.projectDirectory, DOCUMENT_LANGUAGES)
+
+    def key(self, documentPath: str) -> str:
+        if self.projectDirectory:
+            return os.path.relpath(os.path.abspath(documentPath), os.path.abspath(self.projectDirectory))
+        return documentPath
+
+    def language(self, documentPath: str) -> str:
+        return self.languages.get(self.key(documentPath), "")
+
+    def setLanguage(self, documentPath: str, language: str):
+        if language:
+            self.languages[self.key(documentPath)] = language
+        else:
+            self.languages.pop(self.key(documentPath), None)
+        if not self.projectDirectory:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path()), exist_ok=True)
+            temporaryPath = self.path() + ".tmp"
+            with open(temporaryPath, "w", encoding="utf-8") as f:
+                json.dump(self.languages, f, indent=4, sort_keys=True)
+            os.replace(temporaryPath, self.path())
+        except OSError as error:
+            logging.error(
+                "documentLanguages: could not save {}: {}".format(self.path(), error))
@@ -1 +1,5 @@
 USE_STYLESHEETS_FOR_COLOR = False
+# per project data (personal dictionary, caches) is kept in this directory inside the project
+PROJECT_DATA_DIRECTORY = ".lyrical"
+# the LanguageTool language used for grammar checks
+GRAMMAR_LANGUAGE = "en-GB"
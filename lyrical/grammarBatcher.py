@@ -0,0 +1,70 @@
+from bisect import bisect_right
+from grammarCache import GrammarMatch
+
+# characters of paragraph text sent to LanguageTool in one request
+BATCH_CHARACTERS = 10000
+# a blank line keeps LanguageTool from treating neighbouring paragraphs as one sentence
+BATCH_SEPARATOR = "\n\n"
+
+
+def javaLength(text: str) -> int:
+    # LanguageTool reports offsets in UTF-16 code units, as does a QTextBlock
+    return len(text.encode("utf-16-le")) // 2
+
+
+class Batch:
+    """
+    Consecutive paragraphs joined into the text of a single LanguageTool request.
+    items are (key, text) pairs, the key identifies the paragraph to the caller (a QTextBlock, a path).
+    """
+
+    def __init__(self):
+        self.items = []
+        self.starts = []  # the offset of each paragraph within the batch text
+        self.length = 0
+
+    def add(self, key, text: str):
+        if self.items:
+            self.length += javaLength(BATCH_SEPARATOR)
+        self.items.append((key, text))
+        self.starts.append(self.length)
+        self.length += javaLength(text)
+
+    def text(self) -> str:
+        return BATCH_SEPARATOR.join(text for _, text in self.items)
+
+    def splitMatches(self, matches) -> list:
+        """
+        :return: a list of GrammarMatch for each paragraph, in the order of items, with offsets
+        relative to the start of the paragraph. A match across a separator belongs to no paragraph and is dropped.
+        """
+        split = [[] for _ in self.items]
+        for match in matches:
+            index = bisect_right(self.starts, match.offset) - 1
+            if index < 0:
+                continue
+            start = self.starts[index]
+            if match.offset + match.errorLength > start + javaLength(self.items[index][1]):
+                continue
+            split[index].append(GrammarMatch.fromMatch(
+                match, match.offset - start))
+        return split
+
+
+def makeBatches(paragraphs, limit: int = BATCH_CHARACTERS) -> list[Batch]:
+    # packs (key, text) pairs in order into batches of at most limit characters, a longer paragraph goes alone
+    batches = []
+    batch = Batch()
+    for key, text in paragraphs:
+        if batch.items and batch.length + javaLength(BATCH_SEPARATOR) + javaLength(text) > limit:
+            batches.append(batch)
+            batch = Batch()
+        batch.add(key, text)
+    if batch.items:
+        batches.append(batch)
+    return batches
+
+
+def pythonOffset(text: str, offset: int) -> int:
+    # the index into text of an offset counted in UTF-16 code units
+    return len(text.encode("utf-16-le")[:offset * 2].decode("utf-16-le", errors="ignore"))
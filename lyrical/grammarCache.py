@@ -0,0 +1,130 @@
+import hashlib
+import os
+import threading
+import logging
+
+import globals
+from responseCache import ResponseCache
+
+# the grammar matches of each paragraph of a project, keyed by the paragraph text
+GRAMMAR_CACHE = os.path.join(
+    globals.PROJECT_DATA_DIRECTORY, "grammar_cache.sqlite")
+# results only change when LanguageTool is upgraded, a paragraph is re-checked after three months
+GRAMMAR_TTL = 90 * 24 * 60 * 60
+GRAMMAR_CACHE_SIZE = 20000
+MAX_REPLACEMENTS = 10
+
+
+class GrammarMatch:
+    """
+    A LanguageTool match reduced to the fields the correction window uses.
+    Offsets are relative to the start of the paragraph, the window adjusts them as corrections are made.
+    """
+
+    __slots__ = ("offset", "errorLength", "ruleId", "category", "ruleIssueType", "message",
+                 "replacements", "context", "offsetInContext", "sentence")
+
+    def __init__(self, offset: int, errorLength: int, ruleId: str, category: str, ruleIssueType: str,
+                 message: str, replacements: list, context: str, offsetInContext: int, sentence: str):
+        self.offset = offset
+        self.errorLength = errorLength
+        self.ruleId = ruleId
+        self.category = category
+        self.ruleIssueType = ruleIssueType
+        self.message = message
+        self.replacements = replacements
+        self.context = context
+        self.offsetInContext = offsetInContext
+        self.sentence = sentence
+
+    @classmethod
+    def fromMatch(cls, match, offset: int = None):
+        return cls(match.offset if offset is None else offset, match.errorLength, match.ruleId, match.category,
+                   match.ruleIssueType, match.message, list(
+                       match.replacements[:MAX_REPLACEMENTS]),
+                   match.context, match.offsetInContext, match.sentence)
+
+    @classmethod
+    def fromRecord(cls, record: list):
+        return cls(*record)
+
+    def record(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    @property
+    def matchedText(self) -> str:
+        return self.context[self.offsetInContext:self.offsetInContext + self.errorLength]
+
+    def __repr__(self):
+        return "GrammarMatch({} at {}, length {})".format(self.ruleId, self.offset, self.errorLength)
+
+
+def ruleConfiguration(tool) -> str:
+    # everything about the tool that changes which matches a paragraph gets
+    return "|".join([str(tool.language), str(tool.motherTongue),
+                     ",".join(sorted(tool.enabled_rules)), ",".join(
+                         sorted(tool.disabled_rules)),
+                     ",".join(sorted(tool.enabled_categories)), ",".join(
+                         sorted(tool.disabled_categories)),
+                     str(tool.enabled_rules_only), ",".join(sorted(tool.preferred_variants))])
+
+
+def paragraphKey(configuration: str, text: str) -> str:
+    digest = hashlib.sha1()
+    digest.update(configuration.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GrammarCache:
+    """
+    Remembers the grammar matches of each paragraph of the current project, so re-checking a chapter only
+    sends the paragraphs that changed to LanguageTool. Safe to use from the grammar check workers.
+    """
+
+    def __init__(self, projectDirectory: str = None, maxEntries: int = GRAMMAR_CACHE_SIZE):
+        self.maxEntries = maxEntries
+        self.cache = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.setProjectDirectory(projectDirectory)
+
+    def setProjectDirectory(self, projectDirectory: str):
+        with self.lock:
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
+            if projectDirectory:
+                # every paragraph without matches is an empty answer, they are kept as long as the others
+                self.cache = ResponseCache(os.path.join(projectDirectory, GRAMMAR_CACHE), ttl=GRAMMAR_TTL,
+                                           maxEntries=self.maxEntries, emptyTtl=GRAMMAR_TTL)
+
+    def get(self, configuration: str, text: str):
+        """
+        :return: a new list of GrammarMatch for the paragraph, or None if it has to be checked
+        """
+        with self.lock:
+            if self.cache is None:
+                return None
+            entry = self.cache.get(paragraphKey(configuration, text))
+            if entry is None or not entry[1]:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # callers edit the offsets of the matches they are given so each gets its own copies
+        return [GrammarMatch.fromRecord(record) for record in entry[0]]
+
+    def put(self, configuration: str, text: str, matches: list):
+        with self.lock:
+            if self.cache is not None:
+                self.cache.put(paragraphKey(configuration, text),
+                               [match.record() for match in matches])
+
+    def logStatistics(self):
+        logging.debug("grammarCache: {} paragraphs answered from the cache, {} checked".format(
+            self.hits, self.misses))
+
+    def close(self):
+        self.setProjectDirectory(None)
@@ -1,19 +1,24 @@
 from typing import Callable
 import language_tool_python
 from PyQt5.QtCore import pyqtSignal, QObject, pyqtSlot
-from PyQt5.QtGui import QTextDocument, QTextBlockUserData
+from PyQt5.QtGui import QTextBlockUserData
 import logging
 
 
 # background worker
 class GrammarCheck(QObject):
 
-    result = pyqtSignal()
+    # generation, [(blockNumber, text, matches)], paragraphs checked so far, paragraphs to check
+    result = pyqtSignal(int, list, int, int)
+    completed = pyqtSignal(int)  # generation
 
     def __init__(self, parent=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.__matches = {}
         self.content = ""
+        self.engine = None  # the GrammarEngine that checks the paragraphs
+        # the newest request, set from the window's thread so a check in progress sees it has been superseded
+        self.latestGeneration = 0
 
     @pyqtSlot()
     def start(self): print("Thread started")
@@ -43,25 +48,43 @@ class GrammarCheck(QObject):
             print("Offset in context: {}\n".format(match.offset))
             print("Error Length: {}\n".format(match.errorLength))
 
-    @pyqtSlot(QTextDocument)
-    def checkDocument(self, document):
-        for blockIndex in range(document.blockCount()):
-            logging.debug("Finding rules for block {}".format(blockIndex))
-            block = document.findBlockByNumber(blockIndex)
-            logging.debug("Block Text: {}".format(block.text()))
-            self.checkSection(block, blockIndex)
-        self.result.emit()
+    def isCancelled(self, generation: int) -> bool:
+        return generation != self.latestGeneration
+
+    @pyqtSlot(int, list)
+    def checkParagraphs(self, generation, paragraphs):
+        # paragraphs are (blockNumber, text), we work on copies of the text and never touch the window's document
+        if self.isCancelled(generation):
+            logging.debug(
+                "grammarCheck: skipping superseded check {}".format(generation))
+            return
+        paragraphs = [(blockNumber, text)
+                      for blockNumber, text in paragraphs if text != ""]
+        texts = dict(paragraphs)
+        checked = 0
+        # results are handed over a batch at a time so the window can show them as they arrive
+        checks = self.engine.check(paragraphs)
+        for unit in checks:
+            if self.isCancelled(generation):
+                checks.close()  # drops the batches not yet sent
+                logging.debug(
+                    "grammarCheck: cancelled check {}".format(generation))
+                return
+            checked += len(unit)
+            self.result.emit(generation, [(blockNumber, texts[blockNumber], matches)
+                                          for blockNumber, matches in unit], checked, len(paragraphs))
+        if self.engine.cache is not None:
+            self.engine.cache.logStatistics()
+        self.completed.emit(generation)
 
     def checkSection(self, block, blockIndex):
         logging.debug("grammarCheck: Checking Section: {}".format(block.text()))
         self.content = block.text()
         if(self.content != ""):
-            self.__matches = self.__tool.check(self.content)
+            self.__matches = self.engine.findMatches(self.content)
             logging.debug("grammarCheck: checking Section: found {} rules for block {} ".format(
                 self.__matches, blockIndex))
-            userData = QTextBlockUserData()
-            userData.value = self.__matches
-            block.setUserData(userData)
+            self.setMatches(block, self.__matches)
         else:
             logging.debug("grammarCheck: checkSection: Nothing to check")
 
@@ -71,6 +94,11 @@ class GrammarCheck(QObject):
         # (a) Someone hovers over that section of text or
         # (b) As a panel of issues which can be corrected by clicking on the relevant issue
 
+    def setMatches(self, block, matches):
+        userData = QTextBlockUserData()
+        userData.value = matches
+        block.setUserData(userData)
+
     @ property
     def rules(self):
         return self.__matches
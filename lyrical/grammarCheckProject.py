@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import time
+import logging
+
+import manuscript
+from grammarBatcher import BATCH_CHARACTERS, pythonOffset
+from grammarCache import GrammarCache
+from grammarEngine import GrammarEngine, GRAMMAR_WORKERS
+from globals import GRAMMAR_LANGUAGE
+
+# Headless grammar check of every document in a project, for gating a manuscript build.
+# Paragraphs are checked with the same batching and cache as the editor, so a rerun only sends the paragraphs
+# that changed since the last one, and batches are checked concurrently. A JSON report of the matches is
+# written and the exit status is 1 when anything was found. Point --server at a running LanguageTool server
+# (or languageToolStub.py when offline), otherwise a local server is started for the run.
+#
+#   python grammarCheckProject.py ~/novels/myNovel
+#   python grammarCheckProject.py ~/novels/myNovel --server http://localhost:8081 --jobs 8 --output grammar.json
+
+
+def createTool(language: str, server: str):
+    import language_tool_python
+    if server:
+        return language_tool_python.LanguageTool(language, remote_server=server)
+    return language_tool_python.LanguageTool(language)
+
+
+def matchRecord(match, paragraph: int, text: str, position: int) -> dict:
+    # offsets in the report index the paragraph text, LanguageTool counts UTF-16 code units
+    offset = pythonOffset(text, match.offset)
+    length = pythonOffset(text, match.offset + match.errorLength) - offset
+    return {"ruleId": match.ruleId, "category": match.category, "issueType": match.ruleIssueType,
+            "paragraph": paragraph, "offset": offset, "position": position + offset, "length": length,
+            "text": text[offset:offset + length], "replacements": match.replacements, "message": match.message}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Grammar check every document in a project directory")
+    parser.add_argument("project", help="the project directory")
+    parser.add_argument("--language", default=GRAMMAR_LANGUAGE,
+                        help="the LanguageTool language code")
+    parser.add_argument("--server", default=os.environ.get("LYRICAL_LANGUAGETOOL_URL", ""),
+                        help="the url of a running LanguageTool server")
+    parser.add_argument("--jobs", type=int, default=GRAMMAR_WORKERS,
+                        help="the number of concurrent requests")
+    parser.add_argument("--batch", type=int, default=BATCH_CHARACTERS,
+                        help="the characters of text sent in each request")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="check every paragraph, ignoring and leaving the project's grammar cache alone")
+    parser.add_argument("--output", default=None,
+                        help="write the report here instead of to stdout")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    project = arguments.project
+    if not os.path.isdir(project):
+        parser.error("{} is not a directory".format(project))
+    documents = manuscript.findDocuments(project)
+    cache = None if arguments.no_cache else GrammarCache(project)
+    tool = createTool(arguments.language, arguments.server)
+    engine = GrammarEngine([tool], cache, arguments.jobs, arguments.batch)
+
+    paragraphs = []  # ((document, paragraph), text) for every paragraph of the project
+    texts = {}
+    for documentIndex, path in enumerate(documents):
+        for blockNumber, text in enumerate(manuscript.readBlocks(path)):
+            texts[(documentIndex, blockNumber)] = text
+            if text:
+                paragraphs.append(((documentIndex, blockNumber), text))
+
+    start = time.perf_counter()
+    found = {key: matches for unit in engine.check(
+        paragraphs) for key, matches in unit}
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+
+    report = {"project": os.path.abspath(project), "language": arguments.language, "files": [], "matches": 0,
+              "paragraphs": len(paragraphs), "cached": cache.hits if cache is not None else 0,
+              "seconds": round(elapsed, 3)}
+    for documentIndex, path in enumerate(documents):
+        records = []
+        position = 0
+        blockNumber = 0
+        while (documentIndex, blockNumber) in texts:
+            text = texts[(documentIndex, blockNumber)]
+            for match in found.get((documentIndex, blockNumber), []):
+                records.append(matchRecord(
+                    match, blockNumber, text, position))
+            position += len(text) + 1
+            blockNumber += 1
+        report["files"].append({"path": os.path.relpath(path, project), "count": len(records),
+                                "matches": records})
+        report["matches"] += len(records)
+    if cache is not None:
+        cache.close()
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if report["matches"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,26 +3,32 @@ import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel,  QLineEdit, QPushButton, QStatusBar,
                              QVBoxLayout, QMainWindow, QDialog, QScrollArea, qApp, QTextEdit)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
-from PyQt5.QtGui import QTextBlockUserData, QTextDocument, QPalette, QColor
+from PyQt5.QtGui import QTextBlockUserData, QPalette, QColor
 from grammarHighlighter import GrammarHighlighter
 from grammarCheck import GrammarCheck
+from grammarEngine import GrammarEngine, GRAMMAR_WORKERS
 from correctorTextEdit import CorrectorTextEdit
+from highlightScheduler import HighlightScheduler
+import time
 import logging
 
 
 class GrammarCorrectionWindow(QDialog):
 
-    requestCheck = pyqtSignal(QTextDocument)
+    requestCheck = pyqtSignal(int, list)
 
-    def __init__(self, tool):
+    def __init__(self, tool, cache=None, workers=GRAMMAR_WORKERS):
         super().__init__()
         self._textToCorrect = ""
         self._correctedText = ""
         self.tool = tool
+        self.engine = GrammarEngine([tool], cache, workers)
         self._thread = QThread()
+        self.generation = 0
         self.setWindowFlags(Qt.WindowStaysOnTopHint)
         # self.checkGrammar('At lunchtime, we went to Mangan’s Cafe. It was a nice sunny afternoon and we noticed that the staff had put one or two seating areas out on the sidewalk. These were small green cast iron tables with two ruleing chairs; a navy and white table cloth gave the area a novel continental look that, while a little out of place for the town, was pleasant and refreshing. In the centre of the table was a small glass jar with some lavender and soft peach garden roses arranged in an attractive display. We took our seats there and each ordered a sandwich and an coffee. The town looked very pretty in the warm sunshine; the houses seemed a shade more vibrant and the hills in the background, which were usually softened and obscured by mist, were unusually clear and vivid against a cloudless blue sky.')
         self.initializeUI()
+        self.createThreadedCheck()
 
     def reportProgress(self, n):
         logging.debug("Progress Update {}".format(n))
@@ -30,25 +36,61 @@ class GrammarCorrectionWindow(QDialog):
     def check(self, selection):
         self.selection = selection
 
+        self.txtMain.grammarHighlighter.scheduler.beginBulk()
         self.txtMain.setHtml(self.selection.toHtml())
-        self.createThreadedCheck()
+        self.txtMain.grammarHighlighter.scheduler.endBulk()
+        self.requestThreadedCheck()
 
     def createThreadedCheck(self):
-        self.status.showMessage("{}".format(
-            "Reviewing grammar and spelling, please wait"), 2000)
-        self._threaded = GrammarCheck(result=self.checkFinished)
+        # one worker for the life of the window, started once and connected once
+        self._threaded = GrammarCheck(
+            result=self.checkProgress, completed=self.checkFinished)
         self._threaded.tool = self.tool
-        self.requestCheck.connect(self._threaded.checkDocument)
+        self._threaded.engine = self.engine
+        self.requestCheck.connect(self._threaded.checkParagraphs)
         self._thread.started.connect(self._threaded.start)
         self._threaded.moveToThread(self._thread)
         qApp.aboutToQuit.connect(self._thread.quit)
         self._thread.start()
-        self.requestCheck.emit(self.txtMain.document())
 
-    @pyqtSlot()
-    def checkFinished(self):
-        logging.debug("grammarCheckWindow: Check finished")
-        self.txtMain.grammarHighlighter.rehighlight()
+    def requestThreadedCheck(self):
+        self.status.showMessage("{}".format(
+            "Reviewing grammar and spelling, please wait"), 2000)
+        self.generation += 1
+        self.checkStarted = time.monotonic()
+        # a check still running for an earlier selection stops at its next paragraph or batch
+        self._threaded.latestGeneration = self.generation
+        paragraphs = []
+        block = self.txtMain.document().begin()
+        while block.isValid():
+            paragraphs.append((block.blockNumber(), block.text()))
+            block = block.next()
+        self.requestCheck.emit(self.generation, paragraphs)
+
+    @pyqtSlot(int, list, int, int)
+    def checkProgress(self, generation, results, checked, total):
+        if generation != self.generation:
+            return
+        document = self.txtMain.document()
+        for blockNumber, text, matches in results:
+            block = document.findBlockByNumber(blockNumber)
+            if block.isValid() and block.text() == text:
+                userData = QTextBlockUserData()
+                userData.value = matches
+                block.setUserData(userData)
+                self.txtMain.grammarHighlighter.rehighlightBlock(block)
+        elapsed = time.monotonic() - self.checkStarted
+        rate = checked / elapsed if elapsed > 0 else 0
+        remaining = (total - checked) / rate if rate > 0 else 0
+        self.status.showMessage("Checked {} of {} paragraphs, {:.0f} a second, about {:.0f} s left".format(
+            checked, total, rate, remaining))
+
+    @pyqtSlot(int)
+    def checkFinished(self, generation):
+        if generation != self.generation:
+            return
+        logging.debug("grammarCheckWindow: Check finished in {:.2f} s".format(
+            time.monotonic() - self.checkStarted))
         self.status.showMessage("{}".format(
             "Grammar Review Complete"), 2000)
 
@@ -86,6 +128,11 @@ class GrammarCorrectionWindow(QDialog):
         logging.debug(
             "grammarCheckWindow: Removing active rule, rules remaining {}".format(len(rules)))
 
+    def shutdown(self):
+        self.engine.shutdown()
+        self._thread.quit()
+        self._thread.wait()
+
     def acceptCorrections(self):
         self._correctedText = self.txtMain.toHtml()
         self.accept()
@@ -96,6 +143,8 @@ class GrammarCorrectionWindow(QDialog):
             self.wordReplaced)
         self.txtMain.grammarHighlighter = GrammarHighlighter(
             self.txtMain.document(), self.tool)
+        self.txtMain.grammarHighlighter.setScheduler(
+            HighlightScheduler(self.txtMain, self.txtMain.grammarHighlighter))
         self.acceptButton = QPushButton(self)
         self.acceptButton.setText("Accept Corrections")  # text
         self.acceptButton.clicked.connect(self.acceptCorrections)
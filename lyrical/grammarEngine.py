@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import itertools
+import os
+import threading
+import time
+import logging
+
+import grammarBatcher
+from grammarCache import ruleConfiguration
+
+# concurrent requests, the LanguageTool server checks each on its own thread
+GRAMMAR_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+
+class GrammarEngine:
+    """
+    Checks paragraphs against a pool of LanguageTool connections.
+    Paragraphs in the cache are answered at once, the others are packed into batches which are checked
+    concurrently, spread round robin over the given tools (one per server when there are several servers).
+    Results are handed back in document order.
+    language_tool_python restarts a local server from whichever thread saw a request fail, which breaks the
+    requests the other workers have in flight. So each request goes through its own connection that treats
+    the server as remote, and a failed server is restarted here, once, behind a lock.
+    """
+
+    def __init__(self, tools, cache=None, workers: int = GRAMMAR_WORKERS,
+                 batchCharacters: int = grammarBatcher.BATCH_CHARACTERS):
+        self.tools = list(tools)
+        self.cache = cache
+        self.workers = workers
+        self.batchCharacters = batchCharacters
+        self.executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="grammar")
+        self.nextTool = itertools.count()
+        self.restartLock = threading.Lock()
+        self.restarts = 0
+
+    @property
+    def tool(self):
+        return self.tools[0]
+
+    def configuration(self) -> str:
+        return ruleConfiguration(self.tool)
+
+    def cachedMatches(self, text: str):
+        if self.cache is None:
+            return None
+        return self.cache.get(self.configuration(), text)
+
+    def connection(self, tool):
+        if getattr(tool, "_remote", True):
+            return tool  # nothing is restarted, the requests can share the tool
+        connection = copy.copy(tool)
+        connection._remote = True
+        # the copy must not stop the server or drop the tool's spellings when it is collected
+        connection._server = None
+        connection._new_spellings = None
+        return connection
+
+    def restartServer(self, tool, restarts: int) -> bool:
+        # True when the request is worth retrying, the workers that failed together restart the server once
+        if getattr(tool, "_remote", True):
+            return False
+        with self.restartLock:
+            if self.restarts == restarts:
+                logging.warning("grammarEngine: restarting the LanguageTool server")
+                tool._terminate_server()
+                tool._start_local_server()
+                self.restarts += 1
+        return True
+
+    def checkBatch(self, batch) -> list:
+        # one LanguageTool request for the whole batch, the matches are handed back per paragraph
+        tool = self.tools[next(self.nextTool) % len(self.tools)]
+        restarts = self.restarts
+        try:
+            matches = self.connection(tool).check(batch.text())
+        except Exception:
+            if not self.restartServer(tool, restarts):
+                raise
+            matches = self.connection(tool).check(batch.text())
+        split = batch.splitMatches(matches)
+        if self.cache is not None:
+            configuration = self.configuration()
+            for (_, text), matches in zip(batch.items, split):
+                self.cache.put(configuration, text, matches)
+        return split
+
+    def findMatches(self, text: str) -> list:
+        matches = self.cachedMatches(text)
+        if matches is None:
+            batch = grammarBatcher.Batch()
+            batch.add(None, text)
+            matches = self.checkBatch(batch)[0]
+        return matches
+
+    def check(self, paragraphs):
+        """
+        Checks (key, text) pairs, yielding lists of (key, matches) in document order as they become available:
+        a run of cached paragraphs, or the paragraphs of one batch.
+        """
+        start = time.perf_counter()
+        units = []  # each a list of (key, matches), or a (batch, future) pair
+        pending = []
+        for key, text in paragraphs:
+            matches = self.cachedMatches(text)
+            if matches is None:
+                pending.append((key, text))
+                continue
+            if pending:
+                units.extend(self.submit(pending))
+                pending = []
+            if units and isinstance(units[-1], list):
+                units[-1].append((key, matches))
+            else:
+                units.append([(key, matches)])
+        units.extend(self.submit(pending))
+        requests = 0
+        try:
+            for unit in units:
+                if isinstance(unit, list):
+                    yield unit
+                else:
+                    batch, future = unit
+                    requests += 1
+                    yield list(zip((key for key, _ in batch.items), future.result()))
+        finally:
+            # the caller stopped early, batches that have not started are not sent
+            for unit in units:
+                if not isinstance(unit, list):
+                    unit[1].cancel()
+        logging.debug("grammarEngine: checked with {} requests on {} workers in {:.2f} s".format(
+            requests, self.workers, time.perf_counter() - start))
+
+    def submit(self, paragraphs) -> list:
+        return [(batch, self.executor.submit(self.checkBatch, batch))
+                for batch in grammarBatcher.makeBatches(paragraphs, self.batchCharacters)]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -17,6 +17,7 @@ class GrammarHighlighter(QSyntaxHighlighter):
         self.selectionEnd = -1
         self.selectionStart = -1
         self.typeOfCheck = "Spelling"
+        self.scheduler = None
         self.rules = None
 
     # This gets called with each paragraph of a document open in the QTextDocument
@@ -24,6 +25,8 @@ class GrammarHighlighter(QSyntaxHighlighter):
     def highlightBlock(self, text: str) -> None:
         if text == '':
             return
+        if self.scheduler and self.scheduler.defer(self.currentBlock()):
+            return
         self.textToCorrect = text
         block = self.currentBlock()
         # The character format of text in a document specifies the visual properties of the text, as well as information about its role in a hypertext document.
@@ -66,6 +69,9 @@ class GrammarHighlighter(QSyntaxHighlighter):
     def setGrammarRules(self, rules):
         self.rules = rules
 
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+
     def setTypeOfCheck(self, checkType):
         self.typeOfCheck = checkType
 
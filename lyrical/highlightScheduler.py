@@ -0,0 +1,123 @@
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QPoint, QTimer, pyqtSlot
+
+# milliseconds of highlighting we allow ourselves in each idle slice
+SLICE_BUDGET_MS = 8
+
+
+class HighlightScheduler(QObject):
+    """
+    Orders the highlighting of a large document so the blocks visible in the editor are done first.
+
+    While a document is being loaded the highlighter defers every block (see defer). The scheduler then
+    releases the deferred blocks in idle time slices, visible blocks first and then outwards from the
+    viewport, and starts again from the new viewport whenever the user scrolls. Any QSyntaxHighlighter
+    can use it by calling defer at the start of its highlightBlock.
+    """
+
+    def __init__(self, editor, highlighter, sliceBudget: int = SLICE_BUDGET_MS):
+        super().__init__(highlighter)
+        self.editor = editor
+        self.highlighter = highlighter
+        self.sliceBudget = sliceBudget / 1000.0
+        self.active = False
+        self.pending = set()
+        self.released = set()
+        self.blockCount = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.processSlice)
+        self.editor.verticalScrollBar().valueChanged.connect(self.viewportChanged)
+        self.highlighter.document().contentsChange.connect(self.contentsChanged)
+
+    # Call before replacing the document contents
+    def beginBulk(self):
+        self.active = True
+        self.blockCount = 0
+        self.pending.clear()
+        self.released.clear()
+
+    # Call once the contents have been replaced, the deferred blocks are then highlighted in slices
+    def endBulk(self):
+        self.blockCount = self.highlighter.document().blockCount()
+        if self.pending:
+            logging.debug("highlightScheduler: {} blocks deferred".format(
+                len(self.pending)))
+            self.timer.start()
+        else:
+            self.active = False
+
+    # Returns True if the highlighter should skip the block for now
+    def defer(self, block) -> bool:
+        if not self.active:
+            return False
+        number = block.blockNumber()
+        if number in self.released:
+            return False
+        self.pending.add(number)
+        if not self.timer.isActive() and self.blockCount:
+            self.timer.start()
+        return True
+
+    def visibleBlockRange(self) -> tuple[int, int]:
+        viewport = self.editor.viewport()
+        first = self.editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = self.editor.cursorForPosition(
+            QPoint(viewport.width() - 1, viewport.height() - 1)).blockNumber()
+        return first, last
+
+    def blockOrder(self):
+        # the visible blocks, then alternately below and above the viewport
+        first, last = self.visibleBlockRange()
+        yield from range(first, last + 1)
+        below, above = last + 1, first - 1
+        while below < self.blockCount or above >= 0:
+            if below < self.blockCount:
+                yield below
+                below += 1
+            if above >= 0:
+                yield above
+                above -= 1
+
+    @pyqtSlot()
+    def processSlice(self):
+        deadline = time.perf_counter() + self.sliceBudget
+        document = self.highlighter.document()
+        for number in self.blockOrder():
+            if not self.pending:
+                break
+            if number not in self.pending:
+                continue
+            self.pending.discard(number)
+            self.released.add(number)
+            block = document.findBlockByNumber(number)
+            if block.isValid():
+                self.highlighter.rehighlightBlock(block)
+            if time.perf_counter() > deadline:
+                return
+        # anything left refers to blocks that no longer exist
+        self.pending.clear()
+        self.timer.stop()
+        self.active = False
+        self.released.clear()
+        logging.debug("highlightScheduler: all blocks highlighted")
+
+    @pyqtSlot(int)
+    def viewportChanged(self, value):
+        # the next slice starts from the new viewport
+        if self.active and self.pending:
+            self.timer.start()
+
+    @pyqtSlot(int, int, int)
+    def contentsChanged(self, position, removed, added):
+        if not self.active:
+            return
+        count = self.highlighter.document().blockCount()
+        if self.blockCount and count != self.blockCount:
+            # block numbers have shifted, so start again from the viewport with everything deferred
+            self.blockCount = count
+            self.released.clear()
+            self.pending = set(range(count))
+            self.timer.start()
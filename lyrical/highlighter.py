@@ -1,30 +1,38 @@
-import re
+from collections import OrderedDict
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont, QTextDocument
+from PyQt5.QtWidgets import qApp
 
 # from spellCheck import SpellCheck
-from spellCheckWord import SpellCheckWord
+from spellCheckWord import SpellCheckWord, WORD_REGEX
+from spellCheckWorker import SpellCheckWorker
+
+
+# The number of distinct paragraphs whose spelling results we remember
+SPELLING_CACHE_SIZE = 20000
 
 
 class Highlighter(QSyntaxHighlighter):
 
+    requestCheck = pyqtSignal(int, str, int, str)
+
     def __init__(self, parent: QTextDocument) -> None:
         super().__init__(parent)
+        self._thread = QThread()
         self.echoDictionary = {}
         self.blockNumber = -1
         self.selectionEnd = -1
         self.selectionStart = -1
         self.typeOfCheck = "Spelling"
-
-    wordRegEx = re.compile(r"\b([A-Za-z]{2,})\b")  # find words
-    # This gets called with each paragraph of a document open in the QTextDocument
-
-    def highlightBlock(self, text: str) -> None:
-        if not hasattr(self, "speller"):
-            return
-        if text == '':
-            return
+        self.scheduler = None
+        # the language of this document, empty to use the speller's default
+        self.language = ""
+        # misspelling spans keyed by the hash of the block text, each entry is stamped with
+        # the dictionary generation it was computed against
+        self.spellingCache = OrderedDict()
+        # (text hash, generation) queued on the worker: the numbers of the blocks waiting for that result
+        self.pendingChecks = {}
 
         # The character format of text in a document specifies the visual properties of the text, as well as information about its role in a hypertext document.
         self.misspelledFormat = QTextCharFormat()
@@ -37,52 +45,106 @@ class Highlighter(QSyntaxHighlighter):
             QTextCharFormat.WaveUnderline)  # we can set its visual style
         self.echoFormat.setUnderlineColor(Qt.cyan)  # cyan and underlined
 
-        # for spelling and echoes we iterate the text using the regular expression above which identifies word boundaries
-        # find individual words in the contained text
-        for word_object in self.wordRegEx.finditer(text):
-            # we check to see if this is a recognised word
-            wordToCheck = word_object.group()
+    wordRegEx = WORD_REGEX
+    # This gets called with each paragraph of a document open in the QTextDocument
+
+    def highlightBlock(self, text: str) -> None:
+        if not hasattr(self, "speller"):
+            return
+        if text == '':
+            return
+        if self.scheduler and self.scheduler.defer(self.currentBlock()):
+            return
 
-            if not self.speller.check(wordToCheck):
-                self.setFormat(    # if it is not we underline it using the style shown above
+        for start, length, word in self.misspellings(text):
+            # if it is not a recognised word we underline it using the style shown above
+            self.setFormat(start, length, self.misspelledFormat)
+
+        if(self.typeOfCheck == "echoes"):
+            self.highlightEchoes(text)
+
+    # Returns the misspelled ranges for the text if they are known. Otherwise the block is queued on the
+    # background worker, nothing is underlined for now and the block is highlighted again when the result arrives.
+    def misspellings(self, text: str) -> list[tuple[int, int, str]]:
+        key = hash(text)
+        generation = self.speller.generation
+        entry = self.spellingCache.get(key)
+        if entry is not None and entry[0] == generation:
+            self.spellingCache.move_to_end(key)
+            return entry[1]
+        blockNumber = self.currentBlock().blockNumber()
+        waiting = self.pendingChecks.get((key, generation))
+        if waiting is None:
+            self.pendingChecks[(key, generation)] = {blockNumber}
+            self.requestCheck.emit(
+                blockNumber, text, generation, self.language)
+        else:
+            # the same text in another block (a repeated chorus) shares the request
+            waiting.add(blockNumber)
+        return []
+
+    @pyqtSlot(int, str, int, str, list)
+    def applyCheck(self, blockNumber, text, generation, language, ranges):
+        key = hash(text)
+        waiting = self.pendingChecks.pop((key, generation), {blockNumber})
+        if language != self.language:
+            return
+        if generation == self.speller.generation:
+            self.spellingCache[key] = (generation, ranges)
+            self.spellingCache.move_to_end(key)
+            if len(self.spellingCache) > SPELLING_CACHE_SIZE:
+                self.spellingCache.popitem(last=False)
+        # highlighting the waiting blocks again shows the result, or asks again if the dictionary has
+        # changed since the request was made
+        self.rehighlightBlocks(text, waiting)
+
+    # rehighlights the blocks holding text, looking through the document for any that have moved
+    def rehighlightBlocks(self, text: str, blockNumbers: set):
+        moved = False
+        for blockNumber in blockNumbers:
+            block = self.document().findBlockByNumber(blockNumber)
+            if block.isValid() and block.text() == text:
+                self.rehighlightBlock(block)
+            else:
+                moved = True
+        if moved:
+            block = self.document().begin()
+            while block.isValid():
+                if block.blockNumber() not in blockNumbers and block.text() == text:
+                    self.rehighlightBlock(block)
+                block = block.next()
+
+    def highlightEchoes(self, text: str) -> None:
+        # for echoes we iterate the text using the regular expression above which identifies word boundaries
+        if not (self.currentBlock().contains(self.selectionStart) or self.currentBlock().contains(self.selectionEnd)):
+            return
+        if(len(self.echoDictionary) == 0):   # if we have a dictionary of echoed words
+            return
+        for word_object in self.wordRegEx.finditer(text):
+            if word_object.group() in self.echoDictionary:  # check to see if the word is an echo
+                self.setFormat(
                     word_object.start(),  # index of first letter of match
                     # index of last letter - index of first letter= length
                     word_object.end() - word_object.start(),
-                    self.misspelledFormat,
+                    self.echoFormat,
                 )
 
-            currentBlock = self.currentBlock().blockNumber()
-            fln = self.currentBlock().firstLineNumber()
-            position = self.currentBlock().position()
-            startOfBlock = self.selectionStart
-            length = self.currentBlock().length()
-            endOfBlock = self.selectionEnd
-            if(self.typeOfCheck == "echoes"):
-                if(self.currentBlock().contains(startOfBlock) or self.currentBlock().contains(endOfBlock)):
-                    if(len(self.echoDictionary) > 0):   # if we have a dictionary of echoed words
-                        if wordToCheck in self.echoDictionary:  # check to see if the word is an echo
-                            self.setFormat(    # if it is not we underline it using the style shown above
-                                word_object.start(),  # index of first letter of match
-                                # index of last letter - index of first letter= length
-                                word_object.end() - word_object.start(),
-                                self.echoFormat,
-                            )
-            # if(self.typeOfCheck == "grammar"):
-            #     if(self.currentBlock().contains(startOfBlock) or self.currentBlock().contains(endOfBlock)):
-            #         # we could pass a collection of grammar errors with their starting and ending position
-            #         # this would be enough to high light the errors using setFormat
-            #         # But we also need to present the error to the user and then offer them the possibility
-            #         # of correcting the error.
-            #         # Ideally we could present a dialog which shows the error, the suggested replacement and a button to affect the replacement
-            #         # clicking outside the window will cause it to disappear.
-            #         if(len(self.echoDictionary) > 0):   # if we have a dictionary of echoed words
-            #             if wordToCheck in self.echoDictionary:  # check to see if the word is an echo
-            #                 self.setFormat(    # if it is not we underline it using the style shown above
-            #                     word_object.start(),  # index of first letter of match
-            #                     # index of last letter - index of first letter= length
-            #                     word_object.end() - word_object.start(),
-            #                     self.echoFormat,
-            #                 )
+    # A word has been added to the dictionary. Results from the generation before the addition that do not
+    # flag the word remain valid, the others are dropped and only the blocks containing the word are
+    # highlighted again. Checks still in flight come back stale and their blocks ask again.
+    def wordAdded(self, word: str) -> None:
+        word = word.lower()
+        generation = self.speller.generation
+        for key, (entryGeneration, ranges) in list(self.spellingCache.items()):
+            if entryGeneration != generation - 1 or any(misspelled.lower() == word for _, _, misspelled in ranges):
+                del self.spellingCache[key]
+            else:
+                self.spellingCache[key] = (generation, ranges)
+        block = self.document().begin()
+        while block.isValid():
+            if word in block.text().lower():
+                self.rehighlightBlock(block)
+            block = block.next()
 
     # We can set the echoes here. The pool of echoed words form the reference dictionary for our check
 
@@ -96,6 +158,29 @@ class Highlighter(QSyntaxHighlighter):
 
     def setSpeller(self, speller: SpellCheckWord):
         self.speller = speller
+        self._worker = SpellCheckWorker(speller)
+        self._worker.moveToThread(self._thread)
+        self.requestCheck.connect(self._worker.check)
+        self._worker.checked.connect(self.applyCheck)
+        qApp.aboutToQuit.connect(self._thread.quit)
+        self._thread.start()
+
+    def shutdown(self):
+        # checks still queued on the worker are dropped
+        self._thread.quit()
+        self._thread.wait()
+
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+
+    def setLanguage(self, language: str, rehighlight: bool = True):
+        language = language or ""
+        if language != self.language:
+            self.language = language
+            self.spellingCache.clear()
+            self.pendingChecks.clear()
+            if rehighlight:
+                self.rehighlight()
 
     def setTypeOfCheck(self, checkType):
         self.typeOfCheck = checkType
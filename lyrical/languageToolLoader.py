@@ -0,0 +1,161 @@
+import json
+import os
+import socket
+import subprocess
+import time
+from urllib.request import urlopen
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+import logging
+from globals import GRAMMAR_LANGUAGE
+
+SERVER_FILE = "languagetool_server.json"  # pid and port of a server we left running
+SERVER_STARTUP_TIMEOUT = 60  # seconds for a new server to start answering
+SERVER_PING_TIMEOUT = 1
+SERVER_POLL_INTERVAL = 0.25
+SHUTDOWN_WAIT = 2000  # milliseconds to wait for a load still running when the application closes
+
+
+def serverAnswers(url: str) -> bool:
+    try:
+        with urlopen("{}/v2/languages".format(url.rstrip("/")), timeout=SERVER_PING_TIMEOUT) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def processIsRunning(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # it exists but belongs to someone else
+    except OSError:
+        return False
+    return True
+
+
+def freePort() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("localhost", 0))
+        return probe.getsockname()[1]
+
+
+def readServerFile(path: str):
+    # the url of the server recorded in the file if it is still alive, otherwise None
+    try:
+        with open(path, "r") as serverFile:
+            server = json.load(serverFile)
+        pid, port = int(server["pid"]), int(server["port"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    url = "http://localhost:{}".format(port)
+    if processIsRunning(pid) and serverAnswers(url):
+        return url
+    return None
+
+
+def startSharedServer(path: str) -> str:
+    # starts a LanguageTool server that outlives this process and records it for the next start
+    from language_tool_python.download_lt import download_lt
+    from language_tool_python.utils import get_server_cmd
+    download_lt()
+    port = freePort()
+    server = subprocess.Popen(get_server_cmd(port), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, start_new_session=True)
+    url = "http://localhost:{}".format(port)
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while not serverAnswers(url):
+        if server.poll() is not None:
+            raise OSError(
+                "LanguageTool server exited with status {}".format(server.returncode))
+        if time.monotonic() > deadline:
+            server.terminate()
+            raise OSError(
+                "LanguageTool server did not answer on port {}".format(port))
+        time.sleep(SERVER_POLL_INTERVAL)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as serverFile:
+        json.dump({"pid": server.pid, "port": port}, serverFile)
+    logging.debug(
+        "languageToolLoader: started a shared server, pid {} port {}".format(server.pid, port))
+    return url
+
+
+def createLanguageTool(language: str = GRAMMAR_LANGUAGE, serverUrl: str = "", keepServer: bool = False,
+                       serverFile: str = SERVER_FILE):
+    """
+    Connects to LanguageTool, in order of preference:
+    a configured server url, a shared server left running by an earlier session (when keepServer is set),
+    a new shared server (when keepServer is set), or a private server that stops with the application.
+    Slow and blocking, call it from a worker thread.
+    """
+    import language_tool_python
+    if serverUrl:
+        return language_tool_python.LanguageTool(language, remote_server=serverUrl)
+    if keepServer:
+        url = readServerFile(serverFile)
+        if url is not None:
+            logging.debug(
+                "languageToolLoader: reusing the server at {}".format(url))
+        else:
+            url = startSharedServer(serverFile)
+        return language_tool_python.LanguageTool(language, remote_server=url)
+    return language_tool_python.LanguageTool(language)
+
+
+class LanguageToolLoader(QObject):
+    """
+    Creates the LanguageTool connection on its own thread, so the window can be shown while the
+    server starts. Emits ready with the tool, or failed with the reason.
+    """
+
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, language: str = GRAMMAR_LANGUAGE, serverUrl: str = "", keepServer: bool = False,
+                 serverFile: str = SERVER_FILE, parent=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.language = language
+        self.serverUrl = serverUrl
+        self.keepServer = keepServer
+        self.serverFile = serverFile
+        self.thread = None
+
+    def start(self):
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.load)
+        self.thread.start()
+
+    @pyqtSlot()
+    def load(self):
+        start = time.perf_counter()
+        try:
+            tool = createLanguageTool(
+                self.language, self.serverUrl, self.keepServer, self.serverFile)
+        except Exception as error:
+            logging.error(
+                "languageToolLoader: could not start LanguageTool: {}".format(error))
+            self.failed.emit(str(error))
+        else:
+            logging.debug("languageToolLoader: LanguageTool ready in {:.1f} s".format(
+                time.perf_counter() - start))
+            self.ready.emit(tool)
+        self.thread.quit()
+
+    def wait(self, timeout: int = SHUTDOWN_WAIT) -> bool:
+        # a server that is still starting can take a minute, rather than hang the close we abandon the load
+        if self.thread is None or self.thread.wait(timeout):
+            return True
+        logging.warning(
+            "languageToolLoader: abandoning a load still running after {} ms".format(timeout))
+        self.ready.disconnect()
+        self.failed.disconnect()
+        # hand the running thread to Qt so Python never destroys it while it runs
+        sip.transferto(self.thread, None)
+        self.thread = None
+        return False
@@ -0,0 +1,136 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import json
+import re
+import time
+import logging
+
+from grammarBatcher import javaLength
+
+# A local stand in for a LanguageTool server, answering /v2/languages and /v2/check in the same json
+# format with a handful of simple rules. Use it to exercise the grammar checks without Java or a network,
+# --delay makes it behave like a slow server.
+#
+#   python languageToolStub.py --port 8081 --delay 0.05
+#   python grammarCheckProject.py ~/novels/myNovel --server http://localhost:8081
+
+STUB_PORT = 8081
+LANGUAGES = [{"name": "English (GB)", "code": "en", "longCode": "en-GB"},
+             {"name": "English (US)", "code": "en", "longCode": "en-US"},
+             {"name": "German (Germany)", "code": "de", "longCode": "de-DE"},
+             {"name": "French", "code": "fr", "longCode": "fr"}]
+CONTEXT_CHARACTERS = 40
+
+REPEATED_WORD_REGEX = re.compile(r"\b(\w+)\s+(\1)\b", re.IGNORECASE)
+DOUBLE_SPACE_REGEX = re.compile(r"(?<=\S)  +(?=\S)")
+SENTENCE_START_REGEX = re.compile(r"(?:^|[.!?]\s+)([a-z]\w*)")
+A_BEFORE_VOWEL_REGEX = re.compile(r"\b([Aa])\s+([aeiouAEIOU]\w*)")
+SENTENCE_REGEX = re.compile(r"[^.!?]*[.!?]*")
+
+
+def match(text: str, start: int, end: int, ruleId: str, description: str, issueType: str, category: str,
+          message: str, replacements: list[str]) -> dict:
+    contextStart = max(0, start - CONTEXT_CHARACTERS)
+    context = text[contextStart:end + CONTEXT_CHARACTERS]
+    sentence = next((found.group().strip() for found in SENTENCE_REGEX.finditer(text)
+                     if found.start() <= start < found.end()), "")
+    # like LanguageTool, offsets and lengths are in UTF-16 code units
+    length = javaLength(text[start:end])
+    return {"message": message, "shortMessage": "", "replacements": [{"value": value} for value in replacements],
+            "offset": javaLength(text[:start]), "length": length,
+            "context": {"text": context, "offset": javaLength(text[contextStart:start]), "length": length},
+            "sentence": sentence, "type": {"typeName": "Other"},
+            "rule": {"id": ruleId, "description": description, "issueType": issueType,
+                     "category": {"id": category, "name": category.title()}}}
+
+
+def findMatches(text: str, disabledRules=()) -> list[dict]:
+    matches = []
+    for found in REPEATED_WORD_REGEX.finditer(text):
+        matches.append(match(text, found.start(), found.end(), "ENGLISH_WORD_REPEAT_RULE", "Word repetition",
+                             "duplication", "MISC", "Possible typo: you repeated a word", [found.group(1)]))
+    for found in DOUBLE_SPACE_REGEX.finditer(text):
+        matches.append(match(text, found.start(), found.end(), "WHITESPACE_RULE", "Whitespace repetition",
+                             "whitespace", "TYPOGRAPHY", "Possible typo: you repeated a whitespace", [" "]))
+    for found in SENTENCE_START_REGEX.finditer(text):
+        word = found.group(1)
+        matches.append(match(text, found.start(1), found.end(1), "UPPERCASE_SENTENCE_START",
+                             "Checks that a sentence starts with an uppercase letter", "typographical",
+                             "CASING", "This sentence does not start with an uppercase letter.", [word.capitalize()]))
+    for found in A_BEFORE_VOWEL_REGEX.finditer(text):
+        article = "An" if found.group(1) == "A" else "an"
+        matches.append(match(text, found.start(1), found.end(1), "EN_A_VS_AN", "Use of 'a' vs. 'an'",
+                             "misspelling", "MISC", "Use 'an' instead of 'a' if the following word starts with a vowel sound.", [article]))
+    matches = [found for found in matches if found["rule"]
+               ["id"] not in disabledRules]
+    return sorted(matches, key=lambda found: found["offset"])
+
+
+class LanguageToolStubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.answer(url.path, parse_qs(url.query))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        self.answer(urlsplit(self.path).path, parse_qs(body))
+
+    def answer(self, path: str, parameters: dict):
+        time.sleep(self.server.delay)
+        if path.rstrip("/").endswith("/v2/languages"):
+            self.send(200, LANGUAGES)
+        elif path.rstrip("/").endswith("/v2/check"):
+            text = parameters.get("text", [""])[0]
+            language = parameters.get("language", ["en-GB"])[0]
+            disabledRules = set(parameters.get(
+                "disabledRules", [""])[0].split(","))
+            self.server.requests += 1
+            self.send(200, {"software": {"name": "LanguageTool stub", "apiVersion": 1},
+                            "language": {"code": language, "name": language},
+                            "matches": findMatches(text, disabledRules)})
+        else:
+            self.send(404, {"error": "unknown path {}".format(path)})
+
+    def send(self, status: int, answer):
+        body = json.dumps(answer).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info("languageToolStub: " + format % args)
+
+
+class LanguageToolStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay: float = 0):
+        super().__init__(address, LanguageToolStubHandler)
+        self.delay = delay
+        self.requests = 0  # check requests answered
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve grammar checks locally in the LanguageTool format")
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--delay", type=float, default=0,
+                        help="seconds to wait before answering")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server = LanguageToolStubServer(
+        ("localhost", arguments.port), arguments.delay)
+    print("Serving grammar checks on http://localhost:{}/".format(arguments.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
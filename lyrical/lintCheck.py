@@ -1,10 +1,10 @@
 from typing import Callable
 import language_tool_python
 from PyQt5.QtCore import pyqtSignal, QObject, pyqtSlot
-from PyQt5.QtGui import QTextDocument, QTextBlockUserData
+from PyQt5.QtGui import QTextBlockUserData
 import logging
-import proselint
 from rule import Rule
+from lintEngine import LintEngine
 
 options = {
     "max_errors": 1000,
@@ -101,13 +101,17 @@ options = {
 
 class LintCheck(QObject):
 
-    result = pyqtSignal()
+    # generation, [(blockNumber, text, rules)]
+    result = pyqtSignal(int, list)
 
     def __init__(self, parent=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.__suggestions = {}
         self.__rules = []
         self.content = ""
+        # the newest request, set from the window's thread so a check in progress sees it has been superseded
+        self.latestGeneration = 0
+        self.engine = LintEngine(options)
 
     @pyqtSlot()
     def start(self): print("Thread started")
@@ -164,26 +168,39 @@ class LintCheck(QObject):
             print("Offset in context: {}\n".format(match.offset))
             print("Error Length: {}\n".format(match.errorLength))
 
-    @ pyqtSlot(QTextDocument)
-    def checkDocument(self, document):
-        for blockIndex in range(document.blockCount()):
-            logging.debug("Finding rules for block {}".format(blockIndex))
-            block = document.findBlockByNumber(blockIndex)
-            logging.debug("Block Text: {}".format(block.text()))
-            self.checkSection(block, blockIndex)
-        self.result.emit()
+    def isCancelled(self, generation: int) -> bool:
+        return generation != self.latestGeneration
+
+    @ pyqtSlot(int, list)
+    def checkParagraphs(self, generation, paragraphs):
+        # paragraphs are (blockNumber, text), we work on copies of the text and never touch the window's document
+        results = []
+        for blockNumber, text in paragraphs:
+            if self.isCancelled(generation):
+                logging.debug(
+                    "lintCheck: cancelled check {}".format(generation))
+                return
+            if text == "":
+                continue
+            rules = self.findRules(text)
+            if rules:
+                results.append((blockNumber, text, rules))
+        self.result.emit(generation, results)
+
+    def findRules(self, text: str) -> list:
+        self.content = text
+        self.__suggestions = self.engine.lint(text, options)
+        if(len(self.__suggestions) == 0):
+            return []
+        self.convertSuggestionsToRules(self.__suggestions, text)
+        return self.__rules
 
     def checkSection(self, block, blockIndex):
         logging.debug("lintCheck: Checking Section: {}".format(block.text()))
         self.content = block.text()
         # self.content = "He was thinking outside the box."
         if(self.content != ""):
-            self.__suggestions = proselint.tools.lint(
-                self.content, config=options)
-            if(len(self.__suggestions) > 0):
-                print("Suggestions: {}".format(self.__suggestions))
-                self.convertSuggestionsToRules(
-                    self.__suggestions, self.content)
+            if(len(self.findRules(self.content)) > 0):
                 # self.__matches = self.__tool.check(self.content)
                 logging.debug("lintCheck: checking Section: found {} rules for block {} containing text: {} ".format(
                     self.__rules, blockIndex, block.text()))
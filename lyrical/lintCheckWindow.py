@@ -3,25 +3,28 @@ import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel,  QLineEdit, QPushButton, QStatusBar,
                              QVBoxLayout, QMainWindow, QDialog, QScrollArea, qApp, QTextEdit)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
-from PyQt5.QtGui import QTextBlockUserData, QTextDocument, QPalette, QColor
+from PyQt5.QtGui import QTextBlockUserData, QPalette, QColor
 from lintHighlighter import LintHighlighter
 from lintCheck import LintCheck
 from correctorTextEdit import CorrectorTextEdit
+from highlightScheduler import HighlightScheduler
 import logging
 import proselint
 
 
 class LintCorrectionWindow(QDialog):
 
-    requestCheck = pyqtSignal(QTextDocument)
+    requestCheck = pyqtSignal(int, list)
 
     def __init__(self):
         super().__init__()
         self._textToCorrect = ""
         self._correctedText = ""
         self._thread = QThread()
+        self.generation = 0
         self.setWindowFlags(Qt.WindowStaysOnTopHint)
         self.initializeUI()
+        self.createThreadedCheck()
 
     def reportProgress(self, n):
         logging.debug("Progress Update {}".format(n))
@@ -29,22 +32,44 @@ class LintCorrectionWindow(QDialog):
     def check(self, selection):
         self.selection = selection
 
+        self.txtMain.lintHighlighter.scheduler.beginBulk()
         self.txtMain.setHtml(self.selection.toHtml())
-        self.createThreadedCheck()
+        self.txtMain.lintHighlighter.scheduler.endBulk()
+        self.requestThreadedCheck()
 
     def createThreadedCheck(self):
-        self.status.showMessage("{}".format(
-            "Linting the selection, please wait"), 2000)
+        # one worker for the life of the window, started once and connected once
         self._threaded = LintCheck(result=self.checkFinished)
-        self.requestCheck.connect(self._threaded.checkDocument)
+        self.requestCheck.connect(self._threaded.checkParagraphs)
         self._thread.started.connect(self._threaded.start)
         self._threaded.moveToThread(self._thread)
         qApp.aboutToQuit.connect(self._thread.quit)
         self._thread.start()
-        self.requestCheck.emit(self.txtMain.document())
 
-    @pyqtSlot()
-    def checkFinished(self):
+    def requestThreadedCheck(self):
+        self.status.showMessage("{}".format(
+            "Linting the selection, please wait"), 2000)
+        self.generation += 1
+        # a check still running for an earlier selection stops at its next paragraph or batch
+        self._threaded.latestGeneration = self.generation
+        paragraphs = []
+        block = self.txtMain.document().begin()
+        while block.isValid():
+            paragraphs.append((block.blockNumber(), block.text()))
+            block = block.next()
+        self.requestCheck.emit(self.generation, paragraphs)
+
+    @pyqtSlot(int, list)
+    def checkFinished(self, generation, results):
+        if generation != self.generation:
+            return
+        document = self.txtMain.document()
+        for blockNumber, text, matches in results:
+            block = document.findBlockByNumber(blockNumber)
+            if block.isValid() and block.text() == text:
+                userData = QTextBlockUserData()
+                userData.value = matches
+                block.setUserData(userData)
         logging.debug("lintCheckWindow: Check finished")
         self.txtMain.lintHighlighter.rehighlight()
         self.status.showMessage("{}".format(
@@ -84,6 +109,10 @@ class LintCorrectionWindow(QDialog):
         logging.debug(
             "lintCheckWindow: Removing active rule, rules remaining {}".format(len(rules)))
 
+    def shutdown(self):
+        self._thread.quit()
+        self._thread.wait()
+
     def acceptCorrections(self):
         self._correctedText = self.txtMain.toHtml()
         self.accept()
@@ -94,6 +123,8 @@ class LintCorrectionWindow(QDialog):
             self.wordReplaced)
         self.txtMain.lintHighlighter = LintHighlighter(
             self.txtMain.document())
+        self.txtMain.lintHighlighter.setScheduler(
+            HighlightScheduler(self.txtMain, self.txtMain.lintHighlighter))
         self.acceptButton = QPushButton(self)
         self.acceptButton.setText("Accept Corrections")  # text
         self.acceptButton.clicked.connect(self.acceptCorrections)
@@ -0,0 +1,44 @@
+import time
+import logging
+import proselint
+import proselint.tools
+
+
+class LintEngine:
+    """
+    Runs the enabled proselint checks against a paragraph, giving the same results as proselint.tools.lint.
+    proselint.tools.lint imports and collects the check functions on every call, here they are collected once
+    and only collected again when the enabled checks change.
+    """
+
+    def __init__(self, options: dict):
+        self.enabled = None
+        self.checks = []
+        self.maxErrors = options["max_errors"]
+        self.setOptions(options)
+
+    def setOptions(self, options: dict):
+        self.maxErrors = options["max_errors"]
+        enabled = tuple(sorted(name for name, on in options["checks"].items() if on))
+        if enabled == self.enabled:
+            return
+        start = time.perf_counter()
+        self.checks = proselint.tools.get_checks(options)
+        self.enabled = enabled
+        logging.debug("lintEngine: collected {} checks from {} modules in {:.1f} ms".format(
+            len(self.checks), len(enabled), (time.perf_counter() - start) * 1000))
+
+    def lint(self, text: str, options: dict = None) -> list:
+        # (check, message, line, column, start, end, extent, severity, replacements) tuples, as proselint gives them
+        if options is not None:
+            self.setOptions(options)
+        errors = []
+        for check in self.checks:
+            for start, end, name, message, replacements in check(text):
+                line, column = proselint.tools.line_and_column(text, start)
+                if not proselint.tools.is_quoted(start, text):
+                    errors.append((name, message, line, column, start, end,
+                                   end - start, "warning", replacements))
+            if len(errors) > self.maxErrors:
+                break
+        return sorted(errors[:self.maxErrors], key=lambda error: (error[2], error[3]))
@@ -16,6 +16,7 @@ class LintHighlighter(QSyntaxHighlighter):
         self.selectionEnd = -1
         self.selectionStart = -1
         self.typeOfCheck = "Spelling"
+        self.scheduler = None
         self.rules = None
 
     # This gets called with each paragraph of a document open in the QTextDocument
@@ -23,6 +24,8 @@ class LintHighlighter(QSyntaxHighlighter):
     def highlightBlock(self, text: str) -> None:
         if text == '':
             return
+        if self.scheduler and self.scheduler.defer(self.currentBlock()):
+            return
         self.textToCorrect = text
         block = self.currentBlock()
         # The character format of text in a document specifies the visual properties of the text, as well as information about its role in a hypertext document.
@@ -64,6 +67,9 @@ class LintHighlighter(QSyntaxHighlighter):
     def setLintRules(self, rules):
         self.rules = rules
 
+    def setScheduler(self, scheduler):
+        self.scheduler = scheduler
+
     def setTypeOfCheck(self, checkType):
         self.typeOfCheck = checkType
 
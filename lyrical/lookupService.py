@@ -0,0 +1,110 @@
+from typing import Callable
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+import logging
+
+# how long the selection must stay put before we look it up, successive selections within this window coalesce
+LOOKUP_DEBOUNCE = 250
+# one slot for the current lookup and one for a lookup still waiting on a slow network
+LOOKUP_THREADS = 2
+
+
+class LookupTask(QRunnable):
+
+    def __init__(self, service, generation: int, word: str):
+        super().__init__()
+        # the service keeps the task alive until it reports back
+        self.setAutoDelete(False)
+        self.service = service
+        self.generation = generation
+        self.word = word
+
+    def run(self):
+        if not self.service.isCurrent(self.generation):
+            self.service.finished.emit(self.generation, self.word, [])
+            return
+        try:
+            results = self.service.lookup(self.word)
+        except Exception as error:
+            logging.debug(
+                "lookupService: lookup of '{}' failed: {}".format(self.word, error))
+            results = []
+        self.service.finished.emit(self.generation, self.word, results)
+
+
+class LookupService(QObject):
+    """
+    Runs lookups (thesaurus, definitions) on a worker pool so the editor never waits on the network.
+    Requests are debounced, only the latest one is delivered and lookups that are no longer wanted
+    are removed from the pool's queue before they start.
+    """
+
+    resultReady = pyqtSignal(str, list)  # word, results
+    # emitted from the pool threads, delivered on the thread the service lives on
+    finished = pyqtSignal(int, str, list)
+
+    def __init__(self, lookup: Callable[[str], list], parent=None, debounce: int = LOOKUP_DEBOUNCE, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.lookup = lookup
+        self.generation = 0
+        self.pendingWord = None
+        self.queuedTask = None
+        self.tasks = {}  # generation: task, for every task the pool has not finished with
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(LOOKUP_THREADS)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce)
+        self.timer.timeout.connect(self.startLookup)
+        self.finished.connect(self.lookupFinished)
+
+    def isCurrent(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def request(self, word: str):
+        # every request supersedes the ones before it
+        self.generation += 1
+        self.pendingWord = word
+        self.timer.start()
+
+    def lookupNow(self, word: str):
+        self.request(word)
+        self.timer.stop()
+        self.startLookup()
+
+    def cancel(self):
+        self.generation += 1
+        self.pendingWord = None
+        self.timer.stop()
+        self.dropQueuedTask()
+
+    def dropQueuedTask(self):
+        if self.queuedTask is not None and self.pool.tryTake(self.queuedTask):
+            logging.debug("lookupService: dropped the lookup of '{}'".format(
+                self.queuedTask.word))
+            del self.tasks[self.queuedTask.generation]
+        self.queuedTask = None
+
+    @pyqtSlot()
+    def startLookup(self):
+        if self.pendingWord is None:
+            return
+        self.dropQueuedTask()
+        self.queuedTask = LookupTask(self, self.generation, self.pendingWord)
+        self.tasks[self.generation] = self.queuedTask
+        self.pendingWord = None
+        self.pool.start(self.queuedTask)
+
+    @pyqtSlot(int, str, list)
+    def lookupFinished(self, generation: int, word: str, results: list):
+        task = self.tasks.pop(generation, None)
+        if task is self.queuedTask:
+            self.queuedTask = None
+        if not self.isCurrent(generation):
+            logging.debug(
+                "lookupService: discarding the stale result for '{}'".format(word))
+            return
+        self.resultReady.emit(word, results)
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
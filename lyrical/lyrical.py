@@ -21,15 +21,25 @@ import novelPropertiesDialog
 import textEditor
 import resources
 import spellCheckWord
+from personalDictionary import PersonalDictionary
+from documentLanguages import DocumentLanguages, detectLanguage
+import compiledDictionary
 from customFileSystemModel import CustomFileSystemModel
 import thesaurusWebster
+from responseCache import ResponseCache, CachedThesaurus
+from thesaurusSqlite import ThesaurusTheo
+from thesaurusWordnet import ThesaurusWordnet
+from thesaurusResolver import ThesaurusResolver, REMOTE_BUDGET
+from thesaurusPrefetcher import ThesaurusPrefetcher
 import describeWord
 import findDialog
 from specialAction import SpecialAction
 from PyQt5.QtCore import QEvent
 from grammarCheckWindow import GrammarCorrectionWindow
 from lintCheckWindow import LintCorrectionWindow
-import language_tool_python
+from grammarCache import GrammarCache
+from grammarEngine import GRAMMAR_WORKERS
+from languageToolLoader import LanguageToolLoader, SERVER_FILE
 from wordListManager import WordListManager
 import globals
 
@@ -39,6 +49,10 @@ FONT_SIZES = [7, 8, 9, 10, 11, 12, 13, 14,
               18, 24, 36, 48, 64, 72, 96, 144, 288]
 IMAGE_EXTENSIONS = ['.jpg', '.png', '.bmp']
 HTML_EXTENSIONS = ['.htm', '.html', '.txt']
+# milliseconds to wait after an "Add to dictionary" before writing the dictionary
+DICTIONARY_SAVE_DELAY = 2000
+THESAURUS_CACHE = "thesaurus_cache.sqlite"
+DESCRIPTION_CACHE = "description_cache.sqlite"
 
 # When creating a QSettings object, you must pass the name of your company or organization as well as the name of your application.
 ORGANIZATION_NAME = 'Lyrical-Editor'
@@ -108,17 +122,43 @@ class MainWindow(QMainWindow):
             self.palette = self.colorTheme.darkPalette
             appContext.setPalette(self.palette)
         self.word_list_path = "./local_dictionary.txt"
+        self.personalDictionary = PersonalDictionary(
+            self.word_list_path, self.projectCurrentDirectory)
+        # additions are written out in batches rather than one file write per word
+        self.dictionarySaveTimer = QTimer(self)
+        self.dictionarySaveTimer.setSingleShot(True)
+        self.dictionarySaveTimer.setInterval(DICTIONARY_SAVE_DELAY)
+        self.dictionarySaveTimer.timeout.connect(self.personalDictionary.flush)
         layout = QVBoxLayout()  # The QVBoxLayout class lines up widgets vertically
         # this is using the editor class based on QTextEdit above, this is a new member declaration
         self.speller = spellCheckWord.SpellCheckWord(
-            self.getWords(), self.addToDictionary)
-        self.thesaurus = thesaurusWebster.ThesaurusWebster(self.websterAPIkey
-                                                           )
-        self.compliment = describeWord.DescribeWord(
-        )
+            self.getWords(), self.addToDictionary, language=self.language, resourcePath=self.resourcePath)
+        self.documentLanguages = DocumentLanguages(
+            self.projectCurrentDirectory)
+        self.grammarCache = GrammarCache(self.projectCurrentDirectory)
+        self.webster = thesaurusWebster.ThesaurusWebster(self.websterAPIkey
+                                                         )
+        # repeat lookups are answered from disk and previously seen words still work offline
+        self.thesaurusCache = ResponseCache(os.path.join(QStandardPaths.writableLocation(
+            QStandardPaths.AppConfigLocation), THESAURUS_CACHE))
+        self.cachedWebster = CachedThesaurus(self.webster, self.thesaurusCache)
+        # the local thesauruses answer at once, Webster is merged in if it answers within the budget
+        self.thesaurus = ThesaurusResolver(
+            [("theo", ThesaurusTheo(self.resourcePath)),
+             ("wordnet", ThesaurusWordnet(self.resourcePath))],
+            [("webster", self.cachedWebster)],
+            self.thesaurusBudget)
+        self.descriptionCache = ResponseCache(os.path.join(QStandardPaths.writableLocation(
+            QStandardPaths.AppConfigLocation), DESCRIPTION_CACHE))
+        self.compliment = describeWord.DescribeWord(cache=self.descriptionCache
+                                                    )
         self.editor = textEditor.TextEdit(
             self.speller, self.thesaurus, self.compliment)
         self.editor.showSuggestionSignal.connect(self.updateSuggestions)
+        # optionally warm the thesaurus cache with the words around the cursor
+        self.thesaurusPrefetcher = ThesaurusPrefetcher(
+            self.editor, self.cachedWebster.suggestions, self.cachedWebster.isCached, self)
+        self.thesaurusPrefetcher.setEnabled(self.prefetchSynonyms)
         self.editor.updateStatusSignal.connect(self.update_status_bar)
         # Setup the QTextEdit editor configuration
         self.editor.setAutoFormatting(QTextEdit.AutoAll)
@@ -164,12 +204,33 @@ class MainWindow(QMainWindow):
         MainWindow.singleton = MainWindow()
 
     def loadInBackground(self):
-        print("Loading language tool")
-        self.languageTool = language_tool_python.LanguageTool('en-GB')
-        print("Loaded language tool")
-        self.grammarCheck = GrammarCorrectionWindow(self.languageTool)
+        # LanguageTool can take many seconds to start, grammar checking is enabled once it is ready
+        self.languageTool = None
+        self.grammarCheck = None
+        self.checkGrammarAction.setEnabled(False)
+        self.status.showMessage("Starting the grammar checker...", 20000)
+        self.languageToolLoader = LanguageToolLoader(globals.GRAMMAR_LANGUAGE, self.languageToolServer, self.keepLanguageToolServer,
+                                                     os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation), SERVER_FILE))
+        self.languageToolLoader.ready.connect(self.languageToolReady)
+        self.languageToolLoader.failed.connect(self.languageToolFailed)
+        self.languageToolLoader.start()
         self.lintCheck = LintCorrectionWindow()
 
+    @pyqtSlot(object)
+    def languageToolReady(self, tool):
+        self.languageTool = tool
+        self.grammarCheck = GrammarCorrectionWindow(
+            self.languageTool, self.grammarCache, self.grammarWorkers)
+        self.checkGrammarAction.setEnabled(True)
+        self.status.showMessage("The grammar checker is ready", 5000)
+
+    @pyqtSlot(str)
+    def languageToolFailed(self, reason):
+        self.checkGrammarAction.setStatusTip(
+            "Grammar checking is not available: {}".format(reason))
+        self.status.showMessage(
+            "Grammar checking is not available: {}".format(reason), 20000)
+
     def define_suggestions_toolbar(self):
         """
         Defines the tools bar and actions associated with suggestions analysis
@@ -219,15 +280,26 @@ class MainWindow(QMainWindow):
             font = QFont(self.fontFamilies[0])
 
     def getWords(self) -> list[str]:
-        if not os.path.exists(self.word_list_path):
-            open(self.word_list_path, 'w')
-        with open(self.word_list_path, "r") as f:
-            word_list = [line.strip() for line in f]
-        return word_list
+        return list(self.personalDictionary.words())
 
     def addToDictionary(self, new_word: str):
-        with open(self.word_list_path, "a") as f:
-            f.write("\n" + new_word)
+        self.personalDictionary.add(new_word)
+        self.dictionarySaveTimer.start()
+
+    # merges the personal dictionary of the newly selected project into the speller
+    def loadProjectDictionary(self, directory):
+        self.personalDictionary.setProjectDirectory(directory)
+        self.speller.setPersonalWords(self.personalDictionary.words())
+        self.editor.highlighter.rehighlight()
+
+    def setDocumentLanguage(self, language):
+        self.editor.highlighter.setLanguage(language)
+        if self.path:
+            self.documentLanguages.setLanguage(self.path, language)
+
+    def updateDocumentLanguageMenu(self, language):
+        for action in self.documentLanguageGroup.actions():
+            action.setChecked(action.data() == language)
 
     def show_preferences(self, s):
         self.preferencesDialog = preferencesDialog.PreferencesDialog(self)
@@ -238,6 +310,10 @@ class MainWindow(QMainWindow):
             self.fileFormat = self.preferencesDialog.properties.fileFormat
             self.theme = self.preferencesDialog.properties.theme
             self.websterAPIkey = self.preferencesDialog.properties.websterAPIKey
+            self.webster.apiKey = self.websterAPIkey
+            # the new spelling language is loaded the first time it is needed
+            self.speller.setLanguage(self.language)
+            self.editor.highlighter.rehighlight()
         else:
             logging.debug("lyrical :Canceled Showing Preferences!")
 
@@ -665,6 +741,28 @@ class MainWindow(QMainWindow):
         self.replaceLineEdit.returnPressed.connect(self.replaceWord)
         edit_toolbar.addWidget(self.replaceLineEdit)
 
+        # the spelling language of the open document, when it differs from the preferred language
+        self.documentLanguageMenu = edit_menu.addMenu("Document Language")
+        self.documentLanguageGroup = QActionGroup(self)
+        self.documentLanguageGroup.setExclusive(True)
+        for language in [""] + compiledDictionary.availableLanguages(self.resourcePath):
+            languageAction = QAction(language or "Default", self)
+            languageAction.setCheckable(True)
+            languageAction.setData(language)
+            languageAction.setChecked(language == "")
+            languageAction.triggered.connect(
+                lambda checked, language=language: self.setDocumentLanguage(language))
+            self.documentLanguageGroup.addAction(languageAction)
+            self.documentLanguageMenu.addAction(languageAction)
+
+        prefetch_action = QAction("Prefetch synonyms", self)
+        prefetch_action.setStatusTip(
+            "Look up synonyms for the words around the cursor in the background")
+        prefetch_action.setCheckable(True)
+        prefetch_action.setChecked(self.prefetchSynonyms)
+        prefetch_action.triggered.connect(self.edit_toggle_prefetch)
+        edit_menu.addAction(prefetch_action)
+
         preferences_action = QAction(
             QIcon(":/images/images/preferences.png"), "Lyrical Preferences", self)
         preferences_action.setStatusTip("Set Your Lyrical Preferences")
@@ -786,7 +884,10 @@ class MainWindow(QMainWindow):
         # selectedText = self.editor.toPlainText()
         if utilities.isNotBlank(selectedText):
             # selectedText = selectedText.lower()
-            if(self.grammarCheck):
+            if(self.grammarCheck is None):
+                self.status.showMessage(
+                    "The grammar checker is still starting", 5000)
+            else:
                 self.grammarCheck.check(selection)
                 self.grammarCheck.show()
                 if self.grammarCheck.exec():
@@ -947,6 +1048,9 @@ class MainWindow(QMainWindow):
             self.projectExplorerModel.index(directory))
         # update the current project preferences setting
         self.projectCurrentDirectory = directory
+        self.loadProjectDictionary(directory)
+        self.documentLanguages.setProjectDirectory(directory)
+        self.grammarCache.setProjectDirectory(directory)
         self.status.showMessage(
             "Project Directory: " + str(directory), 2000)
 
@@ -1221,13 +1325,13 @@ class MainWindow(QMainWindow):
         style_menu.addAction(findEchoesAction)
         style_toolbar.addAction(findEchoesAction)
 
-        checkGrammarAction = QAction(
+        self.checkGrammarAction = QAction(
             QIcon(":/images/images/grammar.png"), "Grammar Check", self)
-        checkGrammarAction.setStatusTip("Find Grammatical Errors")
-        checkGrammarAction.triggered.connect(
+        self.checkGrammarAction.setStatusTip("Find Grammatical Errors")
+        self.checkGrammarAction.triggered.connect(
             self.checkGrammar)
-        style_menu.addAction(checkGrammarAction)
-        style_toolbar.addAction(checkGrammarAction)
+        style_menu.addAction(self.checkGrammarAction)
+        style_toolbar.addAction(self.checkGrammarAction)
 
         checkLintAction = QAction(
             QIcon(":/images/images/linting.png"), "Lint Check", self)
@@ -1365,8 +1469,8 @@ class MainWindow(QMainWindow):
 
     def lookupWord(self):
         logging.debug("lyrical: lookupWord was called")
-        suggestions = self.thesaurus.suggestions(self.thesaurusLookup.text())
-        self.updateSuggestions(suggestions)
+        # the result arrives through the editor's showSuggestionSignal
+        self.editor.lookupService.lookupNow(self.thesaurusLookup.text())
 
     def findWord(self):
         logging.debug("lyrical: findWord was called: {}".format(
@@ -1387,6 +1491,10 @@ class MainWindow(QMainWindow):
 
         else:
             self.path = path
+            language = self.documentLanguages.language(
+                path) or detectLanguage(text)
+            self.editor.highlighter.setLanguage(language, rehighlight=False)
+            self.updateDocumentLanguageMenu(language)
             # Qt will automatically try and guess the format as txt/html
             self.editor.setText(text)
             self.update_title()
@@ -1439,14 +1547,32 @@ class MainWindow(QMainWindow):
         if dlg.exec_():
             self.editor.print_(dlg.printer())
 
-    def exit_application(self):
+    def shutdownServices(self):
         self.save_settings()
+        self.personalDictionary.flush()
+        self.editor.shutdownServices()
+        self.thesaurusPrefetcher.shutdown()
+        self.thesaurus.shutdown()
+        self.thesaurusCache.close()
+        self.descriptionCache.close()
+        self.languageToolLoader.wait()
+        if self.grammarCheck is not None:
+            self.grammarCheck.shutdown()
+        self.lintCheck.shutdown()
+        self.grammarCache.close()
+
+    def exit_application(self):
+        self.shutdownServices()
         sys.exit()
 
     def update_title(self):
         self.setWindowTitle(
             "%s - Lyrical" % (os.path.basename(self.path) if self.path else "Untitled"))
 
+    def edit_toggle_prefetch(self, checked):
+        self.prefetchSynonyms = checked
+        self.thesaurusPrefetcher.setEnabled(checked)
+
     def edit_toggle_wrap(self):
         self.editor.setLineWrapMode(
             1 if self.editor.lineWrapMode() == 0 else 0)
@@ -1459,6 +1585,12 @@ class MainWindow(QMainWindow):
         # the current active project directory within the root
         settings.setValue("project_current", self.projectCurrentDirectory)
         settings.setValue("webster_api_key", self.websterAPIkey)
+        settings.setValue("thesaurus_budget", self.thesaurusBudget)
+        settings.setValue("thesaurus_prefetch", self.prefetchSynonyms)
+        settings.setValue("languagetool_server", self.languageToolServer)
+        settings.setValue("languagetool_keep_server",
+                          self.keepLanguageToolServer)
+        settings.setValue("grammar_workers", self.grammarWorkers)
         settings.setValue("size", self.size())
         settings.setValue("pos", self.pos())
         logging.debug("lyrical save_settings: Position is {} {}".format(
@@ -1487,6 +1619,19 @@ class MainWindow(QMainWindow):
         self.websterAPIkey = settings.value("webster_api_key")
         if(self.websterAPIkey == None):
             self.websterAPIkey = "Get an API Key at www.dictionaryapi.com"
+        # milliseconds the thesaurus waits for Webster before answering from the local thesauruses alone
+        self.thesaurusBudget = int(settings.value(
+            "thesaurus_budget", REMOTE_BUDGET))
+        self.prefetchSynonyms = settings.value(
+            "thesaurus_prefetch", False, type=bool)
+        # an already running LanguageTool server, or keep the one we start running for the next session
+        self.languageToolServer = settings.value(
+            "languagetool_server", os.environ.get("LYRICAL_LANGUAGETOOL_URL", ""))
+        self.keepLanguageToolServer = settings.value(
+            "languagetool_keep_server", False, type=bool)
+        # concurrent LanguageTool requests during a grammar check
+        self.grammarWorkers = int(settings.value(
+            "grammar_workers", GRAMMAR_WORKERS))
         self.applicationPosition = settings.value("pos")
         logging.debug("lyrical load_settings: Position is {} {}".format(
             self.applicationPosition.x(), self.applicationPosition.y()))
@@ -1521,7 +1666,7 @@ class MainWindow(QMainWindow):
         logging.info("lyrical: Loaded Lyrical settings")
 
     def closeEvent(self, event):
-        self.save_settings()
+        self.shutdownServices()
         event.accept()
 # Used to set the project root directory
 
@@ -8,7 +8,7 @@ a = Analysis(
     ['lyrical.py'],
     pathex=[],
     binaries=[('resources/en.json.gz', 'spellchecker/resources'),('resources/de.json.gz', 'spellchecker/resources'),('resources/es.json.gz', 'spellchecker/resources'),('resources/fr.json.gz', 'spellchecker/resources'),('resources/pt.json.gz', 'spellchecker/resources')],
-    datas=[('literary_resources/beautiful_words.json', 'literary_resources/'),('literary_resources/colours.json', 'literary_resources/'),('literary_resources/descriptors.json', 'literary_resources/'),('literary_resources/smells.json', 'literary_resources/'),('literary_resources/sounds.json', 'literary_resources/'),('literary_resources/touch_words.json', 'literary_resources/')],
+    datas=[('literary_resources/beautiful_words.json', 'literary_resources/'),('literary_resources/colours.json', 'literary_resources/'),('literary_resources/descriptors.json', 'literary_resources/'),('literary_resources/smells.json', 'literary_resources/'),('literary_resources/sounds.json', 'literary_resources/'),('literary_resources/touch_words.json', 'literary_resources/'),('databases/*.lexicon', 'databases/'),('databases/thesaurus.db', 'databases/'),('databases/wordnet.index', 'databases/')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
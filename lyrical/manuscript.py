@@ -0,0 +1,184 @@
+from html.parser import HTMLParser
+import os
+import re
+
+# Reads the documents of a project without Qt so they can be checked from the command line.
+# The blocks returned match the paragraphs (QTextBlocks) the editor shows for the same file.
+DOCUMENT_EXTENSIONS = (".html", ".htm", ".txt", ".text")
+BLOCK_TAGS = {"p", "div", "ul", "ol", "li", "dl", "dt", "dd", "table", "tr", "td", "th",
+              "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre"}
+IGNORED_TAGS = {"head", "script", "title"}
+# Qt stores a <br> as a line separator inside the paragraph
+LINE_SEPARATOR = "\u2028"
+# the whitespace html collapses, unlike a non breaking space
+COLLAPSIBLE_WHITESPACE_REGEX = re.compile(r"[ \t\n\r\f\v]+")
+VOID_TAGS = {"meta", "link", "img", "hr", "input", "col", "area", "base", "wbr"}
+PRESERVING_STYLE_REGEX = re.compile(r"white-space\s*:\s*pre", re.IGNORECASE)
+STYLE_RULE_REGEX = re.compile(r"([^{}]+)\{([^}]*)\}")
+
+
+class TextExtractor(HTMLParser):
+    """
+    Splits html into the same blocks QTextDocument.setHtml creates. A block element starts a new block once
+    it has content, QTextEdit's empty paragraphs are kept, a <br> is a line separator within the block and
+    whitespace is kept where the style says pre or pre-wrap and collapsed elsewhere.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.needBlock = True  # a block element has started or ended, content that follows starts a block
+        self.trailingSpace = False  # whitespace after a block, Qt keeps it only when more text follows
+        self.blockOpened = False  # whitespace at the start of a block element is dropped
+        self.ignoring = 0
+        self.style = []
+        self.preservingTags = set()  # tags a <style> sheet sets to white-space: pre or pre-wrap
+        self.elements = []  # (tag, whitespace preserved, content ignored) of the open elements
+        self.textEditMode = False  # html written by QTextEdit, whose line breaks are only layout
+
+    def preserving(self) -> bool:
+        return bool(self.elements) and self.elements[-1][1]
+
+    def ignoringContent(self) -> bool:
+        return any(ignored for _, _, ignored in self.elements)
+
+    def betweenCells(self) -> bool:
+        return bool(self.elements) and self.elements[-1][0] in ("table", "thead", "tbody", "tfoot", "tr")
+
+    def startBlock(self, text: bool = True):
+        if self.trailingSpace and text and self.blocks:
+            self.blocks[-1].append(" ")
+        self.trailingSpace = False
+        self.blocks.append([])
+        self.needBlock = False
+
+    def lastCharacter(self) -> str:
+        if self.blocks:
+            for part in reversed(self.blocks[-1]):
+                if part:
+                    return part[-1]
+        return ""
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag in IGNORED_TAGS or tag == "style":
+            self.ignoring += 1
+            if tag == "style":
+                self.style.append("")
+            return
+        if tag == "meta" and attributes.get("name") == "qrichtext" and attributes.get("content") == "1":
+            self.textEditMode = True
+            return
+        if tag == "br":
+            if not self.ignoring and not self.ignoringContent():
+                if self.needBlock:
+                    self.startBlock()
+                self.blocks[-1].append(LINE_SEPARATOR)
+            return
+        if tag in VOID_TAGS:
+            return
+        style = attributes.get("style") or ""
+        preserving = (tag == "pre" or tag in self.preservingTags
+                      or bool(PRESERVING_STYLE_REGEX.search(style)) or self.preserving())
+        # QTextEdit writes an empty block as a paragraph holding a <br /> that is not part of the text
+        empty = "-qt-paragraph-type:empty" in style.replace(" ", "")
+        self.elements.append((tag, preserving, empty))
+        if tag in BLOCK_TAGS:
+            self.needBlock = True
+            self.blockOpened = True
+            if empty or (tag == "table" and not self.blocks):
+                # and a table at the start of the document follows an empty block
+                self.startBlock(text=False)
+
+    def handle_endtag(self, tag):
+        if tag in IGNORED_TAGS or tag == "style":
+            self.ignoring = max(0, self.ignoring - 1)
+            if tag == "style" and self.style:
+                self.readStyle(self.style.pop())
+            return
+        if any(openTag == tag for openTag, _, _ in self.elements):
+            while self.elements:
+                openTag, _, _ = self.elements.pop()
+                if openTag == tag:
+                    break
+        if tag in BLOCK_TAGS:
+            self.needBlock = True
+        self.blockOpened = False
+        if tag == "table":
+            # Qt follows a table with a block that text after it continues
+            self.startBlock(text=False)
+
+    def handle_data(self, data):
+        if self.style and self.ignoring:
+            self.style[-1] += data
+            return
+        if self.ignoring or self.ignoringContent():
+            return
+        if self.textEditMode:
+            data = data.replace("\n", "")
+        if self.preserving():
+            data = data.replace("\r", "")
+            if not data:
+                return
+            if self.needBlock:
+                self.startBlock()
+            lines = data.split("\n")
+            self.blocks[-1].append(lines[0])
+            for line in lines[1:]:
+                self.blocks.append([line])
+            return
+        # collapse the whitespace used to lay out the html source
+        length = len(data)
+        data = COLLAPSIBLE_WHITESPACE_REGEX.sub(" ", data)
+        if self.lastCharacter() in ("", " ", LINE_SEPARATOR) or (self.needBlock and data.strip(" ")):
+            data = data.lstrip(" ")
+        if not data:
+            return
+        if self.needBlock:
+            if data == " ":
+                # like Qt, a run of whitespace after a paragraph ends up at its end, a single character is dropped
+                self.trailingSpace = self.trailingSpace or (length > 1 and not self.blockOpened
+                                                            and not self.betweenCells())
+                return
+            self.startBlock()
+        self.blocks[-1].append(data)
+
+    def readStyle(self, sheet: str):
+        for selectors, declarations in STYLE_RULE_REGEX.findall(sheet):
+            if PRESERVING_STYLE_REGEX.search(declarations):
+                self.preservingTags.update(selector.strip().lower()
+                                           for selector in selectors.split(","))
+
+    def text(self) -> list[str]:
+        # a document always has at least one block
+        return ["".join(block) for block in self.blocks] or [""]
+
+
+def isRichText(text: str) -> bool:
+    return text.lstrip()[:1] == "<"
+
+
+def textBlocks(text: str) -> list[str]:
+    if isRichText(text):
+        extractor = TextExtractor()
+        extractor.feed(text)
+        extractor.close()
+        return extractor.text()
+    return text.split("\n")
+
+
+def readBlocks(path: str) -> list[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return textBlocks(f.read())
+
+
+def findDocuments(projectDirectory: str) -> list[str]:
+    documents = []
+    for root, directories, files in os.walk(projectDirectory):
+        # skip our own data and any hidden directories
+        directories[:] = sorted(
+            directory for directory in directories if not directory.startswith("."))
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in DOCUMENT_EXTENSIONS:
+                documents.append(os.path.join(root, name))
+    return documents
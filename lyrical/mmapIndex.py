@@ -0,0 +1,110 @@
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+import sys
+import logging
+
+# A small container format for read-only lookup tables that are memory mapped rather than parsed.
+# The file holds a header, a table of named sections and the raw section bytes. Sections are
+# aligned to 8 bytes so they can be cast directly to arrays of native integers.
+INDEX_MAGIC = b"LYRIDX01"
+HEADER = struct.Struct("<8sBI")  # magic, little endian flag, number of sections
+SECTION = struct.Struct("<16sQQ")  # name, offset, length
+ALIGNMENT = 8
+
+
+class IndexFormatError(Exception):
+    pass
+
+
+def packStrings(strings) -> bytes:
+    # count, offsets[count + 1] and the utf-8 blob. Callers sort the strings if they want to search them.
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = array("I", [0])
+    position = 0
+    for item in encoded:
+        position += len(item)
+        offsets.append(position)
+    return struct.pack("=I", len(encoded)) + offsets.tobytes() + b"".join(encoded)
+
+
+def writeIndex(path: str, sections: dict[str, bytes]) -> None:
+    # we write to a temporary file and swap it in so readers never see a partial index
+    position = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for name, data in sections.items():
+        position += (-position) % ALIGNMENT
+        table.append((name, position, len(data)))
+        position += len(data)
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "wb") as file:
+        file.write(HEADER.pack(INDEX_MAGIC, sys.byteorder == "little", len(sections)))
+        for name, offset, length in table:
+            file.write(SECTION.pack(name.encode("ascii"), offset, length))
+        for (name, offset, length), data in zip(table, sections.values()):
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(data)
+    os.replace(temporaryPath, path)
+    logging.debug("mmapIndex: wrote {} sections to {}".format(len(sections), path))
+
+
+class MmapIndex:
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__map)
+        if len(self.__view) < HEADER.size:
+            raise IndexFormatError("{} is not a lyrical index".format(path))
+        magic, littleEndian, count = HEADER.unpack_from(self.__view, 0)
+        if magic != INDEX_MAGIC or bool(littleEndian) != (sys.byteorder == "little"):
+            raise IndexFormatError(
+                "{} was built for a different index format or byte order".format(path))
+        self.__sections = {}
+        for number in range(count):
+            name, offset, length = SECTION.unpack_from(
+                self.__view, HEADER.size + number * SECTION.size)
+            self.__sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+    def hasSection(self, name: str) -> bool:
+        return name in self.__sections
+
+    def section(self, name: str) -> memoryview:
+        offset, length = self.__sections[name]
+        return self.__view[offset:offset + length]
+
+    def integers(self, name: str, typecode: str = "I") -> memoryview:
+        return self.section(name).cast(typecode)
+
+    def strings(self, name: str) -> "StringArray":
+        return StringArray(self.section(name))
+
+
+class StringArray:
+    # A read only, indexable view over a section written by packStrings
+
+    def __init__(self, view: memoryview):
+        self.count = struct.unpack_from("=I", view, 0)[0]
+        tableEnd = 4 + 4 * (self.count + 1)
+        self.__offsets = view[4:tableEnd].cast("I")
+        self.__blob = view[tableEnd:]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return str(self.__blob[self.__offsets[index]:self.__offsets[index + 1]], "utf-8")
+
+    # Returns the position of the key in a sorted array or -1 if it is not present
+    def find(self, key: str) -> int:
+        position = bisect_left(self, key)
+        if position < self.count and self[position] == key:
+            return position
+        return -1
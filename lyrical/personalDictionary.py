@@ -0,0 +1,94 @@
+import os
+import logging
+import globals
+
+GLOBAL_DICTIONARY = "./local_dictionary.txt"
+# each project keeps its own word list alongside its chapters
+PROJECT_DICTIONARY = os.path.join(
+    globals.PROJECT_DATA_DIRECTORY, "dictionary.txt")
+
+
+class DictionaryLayer:
+    # One word list file, loaded in a single read and saved by atomically replacing the file
+
+    def __init__(self, path: str):
+        self.path = path
+        self.words = set()
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        self.words = set()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.words = {line.strip() for line in f} - {""}
+        self.dirty = False
+        logging.debug("personalDictionary: loaded {} words from {}".format(
+            len(self.words), self.path))
+
+    def add(self, word: str) -> bool:
+        if word in self.words:
+            return False
+        self.words.add(word)
+        self.dirty = True
+        return True
+
+    def save(self):
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporaryPath = self.path + ".tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as f:
+            f.write("\n".join(sorted(self.words)))
+            f.write("\n")
+        os.replace(temporaryPath, self.path)
+        self.dirty = False
+        logging.debug("personalDictionary: saved {} words to {}".format(
+            len(self.words), self.path))
+
+
+class PersonalDictionary:
+    """
+    The user's own words, kept in a global layer shared by every project and an optional per-project layer.
+    Additions only touch memory, flush writes any changed layer in one go.
+    """
+
+    def __init__(self, globalPath: str = GLOBAL_DICTIONARY, projectDirectory: str = None):
+        self.globalLayer = DictionaryLayer(globalPath)
+        self.projectLayer = None
+        self.setProjectDirectory(projectDirectory)
+
+    def setProjectDirectory(self, projectDirectory: str):
+        if self.projectLayer is not None:
+            self.projectLayer.save()
+        if projectDirectory:
+            self.projectLayer = DictionaryLayer(
+                os.path.join(projectDirectory, PROJECT_DICTIONARY))
+        else:
+            self.projectLayer = None
+
+    def words(self) -> set[str]:
+        # the merged view of both layers
+        if self.projectLayer is None:
+            return set(self.globalLayer.words)
+        return self.globalLayer.words | self.projectLayer.words
+
+    def add(self, word: str, project: bool = False) -> bool:
+        if project and self.projectLayer is not None:
+            return self.projectLayer.add(word)
+        return self.globalLayer.add(word)
+
+    @property
+    def dirty(self) -> bool:
+        return self.globalLayer.dirty or (self.projectLayer is not None and self.projectLayer.dirty)
+
+    def flush(self):
+        try:
+            self.globalLayer.save()
+            if self.projectLayer is not None:
+                self.projectLayer.save()
+        except OSError as error:
+            logging.error(
+                "personalDictionary: could not save the dictionary: {}".format(error))
@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtPrintSupport import *
 import preferenceProperties
+from spellCheckWord import SPELLING_LANGUAGES
 import logging
 
 
@@ -71,7 +72,7 @@ class PreferencesDialog(QDialog):
         self.APIKeyLayout.addWidget(self.APIKeyLabel)
         self.APIKeyLayout.addWidget(self.APIKeyEdit)
 
-        languageOptions = ["enu", "eng"]
+        languageOptions = list(SPELLING_LANGUAGES)
 
         self.languageLayout = QHBoxLayout()
         self.languageSelect = QComboBox()
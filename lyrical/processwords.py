@@ -3,12 +3,16 @@ from beautifulwords.beautifulWord import BeautifulWord
 
 from beautifulwords.beautifulWordsCollection import BeautifulWordsCollection
 
+import os
 import thesaurusWordnet
 from nltk.corpus import wordnet
 
+RESOURCE_PATH = os.path.dirname(os.path.abspath(__file__))
+# the WordNet index is opened (or built) the first time a word is looked up
+thesaurus = thesaurusWordnet.ThesaurusWordnet(RESOURCE_PATH)
+
 
 def find_tags(target):
-    thesaurus = thesaurusWordnet.ThesaurusWordnet()
     tags = thesaurus.suggestions(target)
     return tags
 
@@ -31,15 +35,10 @@ def find_all_pos_for_word(target):
         'r': 'Adverb',
         'v': 'Verb'
     }
-    synonyms = wordnet.synsets(target)
+    # the index only records the synsets headed by the word itself
     partsOfSpeech = set()
-    for synset in synonyms:
-        fullName = synset.name().strip()
-        pos = synset.pos().strip()
-        partOfSpeech = wordnet_tag_map.get(synset.pos()).strip()
-        word = synset.name().split('.')[0]
-        if(word == target.lower()):
-            partsOfSpeech.add(partOfSpeech)
+    for pos in thesaurus.partsOfSpeech(target):
+        partsOfSpeech.add(wordnet_tag_map.get(pos))
     return list(partsOfSpeech)
 
 
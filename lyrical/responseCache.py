@@ -0,0 +1,145 @@
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+# Answers from the online services are kept for a month, an empty answer (often an error from the
+# service rather than a word without synonyms) only for a day
+CACHE_TTL = 30 * 24 * 60 * 60
+EMPTY_TTL = 24 * 60 * 60
+CACHE_SIZE = 50000  # entries kept on disk, the least recently used are evicted beyond this
+MEMORY_SIZE = 1000  # entries kept in memory in front of the database
+EVICTION_INTERVAL = 100  # writes between checks of the size cap
+
+
+class ResponseCache:
+    """
+    A persistent cache of parsed service responses, keyed by a string such as the lower cased headword.
+    Entries live in a SQLite database with a small in-memory tier in front of it. Entries older than their
+    time to live are reported as stale rather than dropped, so callers can still use them when offline.
+    Safe to use from the lookup worker threads.
+    """
+
+    def __init__(self, path: str, ttl: float = CACHE_TTL, maxEntries: int = CACHE_SIZE,
+                 memoryEntries: int = MEMORY_SIZE, emptyTtl: float = EMPTY_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.emptyTtl = emptyTtl
+        self.maxEntries = maxEntries
+        self.memoryEntries = memoryEntries
+        self.memory = OrderedDict()  # key: (value, fetched)
+        self.used = {}  # key: time of the memory hits not yet written to the database
+        self.lock = threading.Lock()
+        self.writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "fetched REAL NOT NULL, used REAL NOT NULL)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS entriesUsed ON entries (used)")
+        self.connection.commit()
+
+    def isFresh(self, value, fetched: float) -> bool:
+        ttl = self.ttl if value else min(self.ttl, self.emptyTtl)
+        return time.time() - fetched < ttl
+
+    def remember(self, key: str, value, fetched: float):
+        self.memory[key] = (value, fetched)
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memoryEntries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        :return: (value, fresh) or None if the key has never been stored
+        """
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+                # written back in one go before the next eviction, which goes by the used column
+                self.used[key] = time.time()
+            else:
+                row = self.connection.execute(
+                    "SELECT value, fetched FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                entry = (json.loads(row[0]), row[1])
+                self.remember(key, *entry)
+                self.connection.execute(
+                    "UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+                self.connection.commit()
+        value, fetched = entry
+        return value, self.isFresh(value, fetched)
+
+    def put(self, key: str, value):
+        now = time.time()
+        with self.lock:
+            self.remember(key, value, now)
+            self.used.pop(key, None)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, fetched, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now))
+            self.writes += 1
+            if self.writes % EVICTION_INTERVAL == 0:
+                self.evict()
+            self.connection.commit()
+
+    def writeUsed(self):
+        if self.used:
+            self.connection.executemany("UPDATE entries SET used = ? WHERE key = ?",
+                                        [(used, key) for key, used in self.used.items()])
+            self.used.clear()
+
+    def evict(self):
+        self.writeUsed()
+        count = self.connection.execute(
+            "SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.maxEntries:
+            self.connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used LIMIT ?)",
+                (count - self.maxEntries,))
+            logging.debug("responseCache: evicted {} entries from {}".format(
+                count - self.maxEntries, self.path))
+
+    def close(self):
+        with self.lock:
+            self.writeUsed()
+            self.connection.commit()
+            self.connection.close()
+
+
+class CachedThesaurus:
+    # Puts a ResponseCache in front of a thesaurus whose lookup(word) raises OSError when the service is unreachable
+
+    def __init__(self, thesaurus, cache: ResponseCache):
+        self.thesaurus = thesaurus
+        self.cache = cache
+
+    def isCached(self, word: str) -> bool:
+        entry = self.cache.get(word.lower())
+        return entry is not None and entry[1]
+
+    def suggestions(self, word: str) -> list[str]:
+        if word is None:
+            return []
+        key = word.lower()
+        entry = self.cache.get(key)
+        if entry is not None and entry[1]:
+            return entry[0]
+        try:
+            synonyms = self.thesaurus.lookup(word)
+        except OSError as error:
+            # offline, a stale answer is better than none
+            logging.debug(
+                "responseCache: lookup of '{}' failed: {}".format(word, error))
+            return entry[0] if entry is not None else []
+        self.cache.put(key, synonyms)
+        return synonyms
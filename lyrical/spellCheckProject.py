@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import sys
+import logging
+
+import compiledDictionary
+import manuscript
+from documentLanguages import DocumentLanguages, detectLanguage
+from personalDictionary import PersonalDictionary, GLOBAL_DICTIONARY
+from spellCheckWord import SpellCheckWord, spellingLanguage
+
+# Headless spell check of every document in a project, for gating a manuscript build.
+# Documents are checked in parallel with the same rules, dictionaries and personal words as the editor
+# and a JSON report of the misspellings is written. The exit status is 1 when anything was found.
+#
+#   python spellCheckProject.py ~/novels/myNovel
+#   python spellCheckProject.py ~/novels/myNovel --language de --jobs 4 --output spelling.json
+
+speller = None  # one per worker process
+
+
+def startWorker(personalWords: list[str], language: str, resourcePath: str):
+    global speller
+    speller = SpellCheckWord(personalWords, lambda word: None,
+                             language, resourcePath)
+
+
+def checkDocument(path: str, language: str) -> dict:
+    misspellings = []
+    position = 0
+    for blockNumber, text in enumerate(manuscript.readBlocks(path)):
+        for start, length, word in speller.misspelledRanges(text, language):
+            misspellings.append({"word": word, "paragraph": blockNumber, "offset": start,
+                                 "position": position + start, "length": length})
+        position += len(text) + 1
+    return {"language": language, "misspellings": misspellings}
+
+
+def documentLanguage(path: str, languages: DocumentLanguages, default: str) -> str:
+    language = languages.language(path)
+    if not language:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            language = detectLanguage(f.read(2000))
+    return language or default
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Spell check every document in a project directory")
+    parser.add_argument("project", help="the project directory")
+    parser.add_argument("--language", default="en",
+                        help="the language of documents without one of their own")
+    parser.add_argument("--dictionary", default=GLOBAL_DICTIONARY,
+                        help="the global personal dictionary")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="the number of worker processes, defaults to one per cpu")
+    parser.add_argument("--output", default=None,
+                        help="write the report here instead of to stdout")
+    parser.add_argument("--resources", default="",
+                        help="the directory containing the spellchecker resources")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    project = arguments.project
+    if not os.path.isdir(project):
+        parser.error("{} is not a directory".format(project))
+    documents = manuscript.findDocuments(project)
+    personalWords = sorted(PersonalDictionary(arguments.dictionary, project).words())
+    languages = DocumentLanguages(project)
+    default = spellingLanguage(arguments.language)
+    documentLanguages = [documentLanguage(path, languages, default) for path in documents]
+    # compile any missing dictionaries here so the workers don't race to build the same file
+    for language in set(documentLanguages):
+        compiledDictionary.openDictionary(language, arguments.resources)
+
+    report = {"project": os.path.abspath(project), "files": [], "misspellings": 0}
+    with ProcessPoolExecutor(arguments.jobs, initializer=startWorker,
+                             initargs=(personalWords, default, arguments.resources)) as executor:
+        results = executor.map(checkDocument, documents, documentLanguages,
+                               chunksize=max(1, len(documents) // 64))
+        for path, result in zip(documents, results):
+            count = len(result["misspellings"])
+            report["files"].append(
+                {"path": os.path.relpath(path, project), "count": count, **result})
+            report["misspellings"] += count
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if report["misspellings"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,57 +1,147 @@
 from typing import Callable
-from spellchecker import SpellChecker
-from PyQt5.QtCore import QTemporaryFile
+from collections import OrderedDict
+import re
+import threading
+import logging
+
+import compiledDictionary
+from symmetricDelete import SymmetricDeleteSuggester, DEFAULT_MAX_DISTANCE
+
+WORD_REGEX = re.compile(r"\b([^\W\d_]{2,})\b")  # find words, in any of the supported alphabets
+# the language preference values and the dictionary each one uses
+SPELLING_LANGUAGES = {"enu": "en", "eng": "en", "deu": "de", "spa": "es",
+                      "fra": "fr", "por": "pt", "rus": "ru", "ara": "ar"}
+# the number of language dictionaries we keep open at once
+MAX_LOADED_LANGUAGES = 3
+
+
+def spellingLanguage(preference: str) -> str:
+    if not preference:
+        return "en"
+    return SPELLING_LANGUAGES.get(preference, preference)
 
 
 class SpellCheckWord:
     def __init__(
-        self, personal_word_list: list[str], addToDictionary: Callable[[str], None]
+        self, personal_word_list: list[str], addToDictionary: Callable[[str], None],
+        language: str = "en", resourcePath: str = "", maxDistance: int = DEFAULT_MAX_DISTANCE
     ):
-        # Creating temporary file
-        self.file = QTemporaryFile()
-        self.file.open()
- # DictWithPWL() is an inbuilt method of enchant module. It is used to combine a language dictionary and a custom dictionary also known as Personal Word List(PSL).
-        self.dictionary = SpellChecker()
+        # The language dictionaries are precompiled, memory mapped indexes so there is nothing to parse here.
+        # They are opened the first time a language is needed and the least recently used is closed once
+        # more than MAX_LOADED_LANGUAGES are open. The personal word list sits on top of them as an in memory set.
+        self.resourcePath = resourcePath
+        self.maxDistance = maxDistance
+        self.loadedLanguages = OrderedDict()
+        self.lock = threading.Lock()  # the highlighter's worker thread also loads languages
+        self.language = spellingLanguage(language)
 
         self.addToDictionary = addToDictionary
+        # bumped whenever the dictionary changes so cached results can be validated
+        self.generation = 0
         self.word_list = set(personal_word_list)
         self.load_words()  # we can load a customised dictionary
+        self.languageResources(self.language)
+
+    def languageResources(self, language: str = None):
+        language = language or self.language
+        with self.lock:
+            if language in self.loadedLanguages:
+                self.loadedLanguages.move_to_end(language)
+                return self.loadedLanguages[language]
+            logging.debug(
+                "spellCheckWord: loading the '{}' dictionary".format(language))
+            dictionary = compiledDictionary.openDictionary(
+                language, self.resourcePath)
+            suggester = SymmetricDeleteSuggester(dictionary, self.maxDistance)
+            suggester.setWords(self.personalWords)
+            self.loadedLanguages[language] = (dictionary, suggester)
+            if len(self.loadedLanguages) > MAX_LOADED_LANGUAGES:
+                evicted, _ = self.loadedLanguages.popitem(last=False)
+                logging.debug(
+                    "spellCheckWord: closed the '{}' dictionary".format(evicted))
+            return dictionary, suggester
+
+    @property
+    def dictionary(self):
+        return self.languageResources()[0]
+
+    @property
+    def suggester(self):
+        return self.languageResources()[1]
+
+    # switches the default language, the dictionary is loaded when it is first used
+    def setLanguage(self, language: str):
+        language = spellingLanguage(language)
+        if language != self.language:
+            self.language = language
+            self.generation += 1
 
     def load_words(self):
-        for word in self.word_list:
-            self.dictionary.word_frequency.add(word)
+        # a single bulk load, the suggestion index for these words is built when first needed
+        self.personalWords = {word.lower() for word in self.word_list}
+        for dictionary, suggester in list(self.loadedLanguages.values()):
+            suggester.setWords(self.personalWords)
+
+    # replaces the personal word list, for example when a different project is opened
+    def setPersonalWords(self, personal_word_list):
+        self.word_list = set(personal_word_list)
+        self.load_words()
+        self.generation += 1
+
+    def known(self, word: str, language: str = None) -> bool:
+        word = word.lower()
+        return word in self.personalWords or word in self.languageResources(language)[0]
 
-    def suggestions(self, word: str) -> list[str]:
+    def frequency(self, word: str, language: str = None) -> int:
+        word = word.lower()
+        return self.languageResources(language)[0].frequency(word) + (1 if word in self.personalWords else 0)
+
+    # The correction and the candidates come from a single lookup, the correction is the first entry
+    def suggestions(self, word: str, language: str = None) -> list[str]:
         if word is not None:
-            candidates_s = self.dictionary.candidates(word)
-            if(candidates_s):
-                candidates = list(candidates_s)
-                candidates.insert(0, self.correction(word))
-                return candidates
-            else:
-                return []
+            suggester = self.languageResources(language)[1]
+            return [suggestion for suggestion, distance in suggester.lookup(word.lower())]
         else:
             return []
 
-    def correction(self, word: str) -> str:
-        return self.dictionary.correction(word)
+    def candidates(self, word: str, language: str = None) -> set[str]:
+        return set(self.suggestions(word, language))
+
+    def correction(self, word: str, language: str = None) -> str:
+        suggestions = self.suggestions(word, language)
+        if not suggestions:
+            return word
+        return suggestions[0]
 
     def add(self, new_word: str) -> bool:
         if self.check(new_word):
             return False
         self.word_list.add(new_word)
         self.addToDictionary(new_word)
-        self.dictionary.word_frequency.add(new_word)
+        self.personalWords.add(new_word.lower())
+        for dictionary, suggester in list(self.loadedLanguages.values()):
+            suggester.addWords([new_word.lower()])
+        self.generation += 1
         return True
 
-    def check(self, word: str) -> bool:
+    def check(self, word: str, language: str = None) -> bool:
         if(word is not None):
-            result = self.dictionary.known([word])
-            if len(result):
-                return True
+            return self.known(word, language)
         else:
             return False
 
+    # returns (start, length, word) for every unrecognised word in the text
+    def misspelledRanges(self, text: str, language: str = None) -> list[tuple[int, int, str]]:
+        ranges = []
+        dictionary = self.languageResources(language)[0]
+        for word_object in WORD_REGEX.finditer(text):
+            wordToCheck = word_object.group()
+            lowered = wordToCheck.lower()
+            if lowered not in self.personalWords and lowered not in dictionary:
+                ranges.append((word_object.start(),
+                              word_object.end() - word_object.start(), wordToCheck))
+        return ranges
+
     # sets are unordered, has no duplicates and its items are unchangeable
     def getNewWords(self) -> set[str]:
         return self.word_list
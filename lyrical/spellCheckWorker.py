@@ -0,0 +1,24 @@
+from PyQt5.QtCore import pyqtSignal, QObject, pyqtSlot
+import logging
+
+
+# background worker, tokenizes blocks and checks them against the speller off the GUI thread
+class SpellCheckWorker(QObject):
+
+    # block number, block text, dictionary generation, language, misspelled (start, length, word) ranges
+    checked = pyqtSignal(int, str, int, str, list)
+
+    def __init__(self, speller, parent=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.speller = speller
+
+    @pyqtSlot(int, str, int, str)
+    def check(self, blockNumber, text, generation, language):
+        if generation != self.speller.generation:
+            # the dictionary changed after this was queued, the stale answer makes the highlighter ask again
+            logging.debug(
+                "spellCheckWorker: skipping stale request for block {}".format(blockNumber))
+            self.checked.emit(blockNumber, text, generation, language, [])
+            return
+        self.checked.emit(blockNumber, text, generation, language,
+                          self.speller.misspelledRanges(text, language or None))
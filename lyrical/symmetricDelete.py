@@ -0,0 +1,147 @@
+from array import array
+from bisect import bisect_left
+import struct
+import threading
+import zlib
+
+# Symmetric delete spelling suggestions (the SymSpell approach). At build time every dictionary word
+# is reduced to the strings left after deleting up to maxDistance characters from its prefix and
+# those deletes are indexed. At query time the same deletes are generated for the misspelled word
+# and looked up, which finds every candidate without generating inserts, replaces or transposes.
+DEFAULT_MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+SETTINGS = struct.Struct("=II")  # max distance, prefix length
+HASH_SHIFT = 32
+HASH_MASK = 0xFFFFFFFF
+
+
+def deletes(word: str, maxDistance: int) -> set[str]:
+    # the word itself plus every string reachable by deleting up to maxDistance characters
+    result = {word}
+    frontier = {word}
+    for _ in range(maxDistance):
+        nextFrontier = set()
+        for item in frontier:
+            if len(item) > 1:
+                for position in range(len(item)):
+                    nextFrontier.add(item[:position] + item[position + 1:])
+        nextFrontier -= result
+        result |= nextFrontier
+        frontier = nextFrontier
+    return result
+
+
+def hashDelete(delete: str) -> int:
+    return zlib.crc32(delete.encode("utf-8"))
+
+
+def buildDeleteIndex(words, maxDistance: int = DEFAULT_MAX_DISTANCE, prefixLength: int = PREFIX_LENGTH) -> dict[str, bytes]:
+    # Each entry packs the delete hash and the word position into one integer so the index
+    # is a single sorted array that can be searched in place once it is memory mapped.
+    entries = array("Q")
+    for position, word in enumerate(words):
+        for delete in deletes(word[:prefixLength], maxDistance):
+            entries.append((hashDelete(delete) << HASH_SHIFT) | position)
+    entries = array("Q", sorted(set(entries)))
+    return {"deletes": entries.tobytes(),
+            "deleteSettings": SETTINGS.pack(maxDistance, prefixLength)}
+
+
+def editDistance(source: str, target: str, maxDistance: int) -> int:
+    # Optimal string alignment distance, returns maxDistance + 1 as soon as the limit is exceeded
+    if abs(len(source) - len(target)) > maxDistance:
+        return maxDistance + 1
+    previousRow = None
+    row = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        beforeRow, previousRow, row = previousRow, row, [i] + [0] * len(target)
+        smallest = row[0]
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previousRow[j] + 1, row[j - 1] + 1,
+                        previousRow[j - 1] + cost)
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                value = min(value, beforeRow[j - 2] + 1)
+            row[j] = value
+            smallest = min(smallest, value)
+        if smallest > maxDistance:
+            return maxDistance + 1
+    return row[-1]
+
+
+class SymmetricDeleteSuggester:
+    # Suggestions over a CompiledDictionary plus a small set of extra (personal) words
+
+    def __init__(self, dictionary, maxDistance: int = DEFAULT_MAX_DISTANCE):
+        self.dictionary = dictionary
+        self.deleteIndex = dictionary.index.integers("deletes", "Q")
+        self.indexDistance, self.prefixLength = SETTINGS.unpack(
+            dictionary.index.section("deleteSettings"))
+        self.maxDistance = min(maxDistance, self.indexDistance)
+        # extra words are indexed in memory, the first time a suggestion is needed
+        self.extraWords = set()
+        self.extraDeletes = None
+        # words are added from the GUI thread while the spell check worker looks them up
+        self.lock = threading.Lock()
+
+    def setWords(self, words) -> None:
+        with self.lock:
+            self.extraWords = set(words)
+            self.extraDeletes = None
+
+    def addWords(self, words) -> None:
+        with self.lock:
+            self.extraWords.update(words)
+            if self.extraDeletes is not None:
+                self.indexWords(words)
+
+    def indexWords(self, words) -> None:
+        for word in words:
+            for delete in deletes(word[:self.prefixLength], self.indexDistance):
+                self.extraDeletes.setdefault(delete, set()).add(word)
+
+    def candidateWords(self, delete: str):
+        key = hashDelete(delete) << HASH_SHIFT
+        position = bisect_left(self.deleteIndex, key)
+        while position < len(self.deleteIndex) and self.deleteIndex[position] >> HASH_SHIFT == key >> HASH_SHIFT:
+            yield self.dictionary.words[self.deleteIndex[position] & HASH_MASK]
+            position += 1
+        with self.lock:
+            # setWords may have dropped the index since the lookup started
+            extra = tuple(self.extraDeletes.get(delete, ())) if self.extraDeletes is not None else ()
+        yield from extra
+
+    def lookup(self, word: str, maxDistance: int = None, closestOnly: bool = True) -> list[tuple[str, int]]:
+        """
+        Find dictionary words within maxDistance edits of word
+        :param word: the (lower case) word to correct
+        :param maxDistance: defaults to the distance the suggester was configured with
+        :param closestOnly: only return the words at the smallest distance found
+        :return: (suggestion, distance) pairs, closest and most frequent first
+        """
+        with self.lock:
+            if self.extraDeletes is None:
+                self.extraDeletes = {}
+                self.indexWords(self.extraWords)
+        if maxDistance is None:
+            maxDistance = self.maxDistance
+        maxDistance = min(maxDistance, self.indexDistance)
+        seen = set()
+        found = []
+        for delete in deletes(word[:self.prefixLength], maxDistance):
+            for candidate in self.candidateWords(delete):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = editDistance(word, candidate, maxDistance)
+                if distance <= maxDistance:
+                    found.append((candidate, distance))
+        if closestOnly and found:
+            closest = min(distance for _, distance in found)
+            found = [item for item in found if item[1] == closest]
+        found.sort(key=lambda item: (item[1], -self.frequency(item[0]), item[0]))
+        return found
+
+    def frequency(self, word: str) -> int:
+        return self.dictionary.frequency(word)
@@ -4,16 +4,21 @@ from PyQt5.QtCore import *
 from PyQt5.QtPrintSupport import *
 import logging
 import re
+import time
 from specialAction import SpecialAction
 from highlighter import Highlighter
+from highlightScheduler import HighlightScheduler
 # from spellCheck import SpellCheck
 from spellCheckWord import SpellCheckWord
 from describeWord import DescribeWord
 from thesaurusWordnet import ThesaurusWordnet
-from thesaurusWebster import ThesaurusWebster
+from lookupService import LookupService
 import collections
 from pprint import pprint
 
+# milliseconds each context menu provider has to answer before its submenu gives up
+PROVIDER_TIMEOUTS = {"spelling": 1000, "thesaurus": 3000, "descriptions": 6000}
+
 
 class TextEdit(QTextEdit):
 
@@ -21,7 +26,8 @@ class TextEdit(QTextEdit):
     updateStatusSignal = pyqtSignal(str)
 
     def __init__(self, *args):
-        if args and type(args[0]) == SpellCheckWord and type(args[1]) == ThesaurusWebster and type(args[2]) == DescribeWord:
+        # the thesaurus can be any object with suggestions(word), e.g. a cached ThesaurusWebster
+        if args and type(args[0]) == SpellCheckWord and hasattr(args[1], "suggestions") and type(args[2]) == DescribeWord:
             super().__init__(*args[3:])
             self.speller = args[0]
             self.thesaurus = args[1]
@@ -30,6 +36,23 @@ class TextEdit(QTextEdit):
             self.grammarCheckSet = False
             self.acceptRichText = False
             self.setObjectName("HeaderBackgroundColor")
+            # thesaurus lookups run in the background, selections made in quick succession are coalesced
+            self.lookupService = LookupService(
+                self.thesaurus.suggestions, self)
+            self.lookupService.resultReady.connect(self.showSynonyms)
+            # The context menu providers run concurrently, each fills in its submenu when it answers
+            self.spellingService = LookupService(
+                lambda word: self.speller.suggestions(word, self.highlighter.language or None), self, debounce=0)
+            self.complimentService = LookupService(
+                self.compliment.suggestions, self, debounce=0)
+            self.providerServices = {"spelling": self.spellingService,
+                                     "thesaurus": self.lookupService,
+                                     "descriptions": self.complimentService}
+            for provider, service in self.providerServices.items():
+                service.resultReady.connect(
+                    lambda word, results, provider=provider: self.providerAnswered(provider, word, results))
+            self.menuWord = None
+            self.providerMenus = {}  # provider: (submenu, slot, start time) for the menu being shown
             self.copyAvailable.connect(self.selectedTextChanged)
         else:
             super().__init__(*args)
@@ -37,6 +60,14 @@ class TextEdit(QTextEdit):
         self.highlighter = Highlighter(self.document())
         if hasattr(self, "speller"):
             self.highlighter.setSpeller(self.speller)
+        # large documents are highlighted viewport first rather than in document order
+        self.highlighter.setScheduler(
+            HighlightScheduler(self, self.highlighter))
+
+    def setText(self, text):
+        self.highlighter.scheduler.beginBulk()
+        super().setText(text)
+        self.highlighter.scheduler.endBulk()
 
     # this allows us to customise pasting actions :paste
 
@@ -105,34 +136,63 @@ class TextEdit(QTextEdit):
             if " " not in selectedText:  # we check for spaces in the phrase and if we find none then we assume they have selected an isolated word
                 if (selectedText != "") and (selectedText is not None):
                     # logging.debug("We selected {}".format(selectedText))
-                    suggestions = self.thesaurus.suggestions(selectedText)
-                    self.showSuggestionSignal.emit(suggestions)
+                    self.lookupService.request(selectedText)
                 else:
+                    self.lookupService.cancel()
                     self.showSuggestionSignal.emit([])
 
+    @ pyqtSlot(str, list)
+    def showSynonyms(self, word, suggestions):
+        self.showSuggestionSignal.emit(suggestions)
+
+    def shutdownServices(self):
+        self.highlighter.shutdown()
+        for service in self.providerServices.values():
+            service.shutdown()
+
     def addHelperContexts(self, wordToCheck):
-        suggestions = self.speller.suggestions(wordToCheck)
-        alternatives = self.thesaurus.suggestions(wordToCheck)
-        compliments = self.compliment.suggestions(wordToCheck)
+        # The menu is shown at once with a placeholder in each submenu, the providers answer in the background
+        self.menuWord = wordToCheck
+        self.providerMenus = {}
+        misspelled = not self.speller.check(
+            wordToCheck, self.highlighter.language or None)
         if(self.grammarCheckSet):
             self.createGrammarCorrectionMenu()
-        if len(suggestions) > 0:
+        submenus = [("thesaurus", self.createSynonymsMenu(None), self.replaceWord),
+                    ("descriptions", self.createComplimentsMenu(None), self.replaceWord)]
+        if misspelled:
+            submenus.insert(0, ("spelling", self.createSuggestionsMenu(None), self.correctWord))
+        for provider, submenu, slot in submenus:
             self.contextMenu.addSeparator()
-            self.contextMenu.addMenu(
-                self.createSuggestionsMenu(suggestions))
-            self.contextMenu.addSeparator()
-            self.contextMenu.addMenu(
-                self.createSynonymsMenu(alternatives))
-            self.contextMenu.addSeparator()
-            self.contextMenu.addMenu(
-                self.createComplimentsMenu(compliments))
-        if not self.speller.check(wordToCheck):
+            self.contextMenu.addMenu(submenu)
+            self.providerMenus[provider] = (submenu, slot, time.perf_counter())
+            self.providerServices[provider].lookupNow(wordToCheck)
+            QTimer.singleShot(PROVIDER_TIMEOUTS[provider],
+                              lambda provider=provider, word=wordToCheck: self.providerTimedOut(provider, word))
+        if misspelled:
             addToDictionary_action = SpecialAction(
                 "Add to dictionary", self.contextMenu
             )
             addToDictionary_action.triggered.connect(self.addToDictionary)
             self.contextMenu.addAction(addToDictionary_action)
 
+    def providerAnswered(self, provider, word, results):
+        if word != self.menuWord or provider not in self.providerMenus:
+            return  # the menu has closed or the provider already timed out
+        submenu, slot, started = self.providerMenus.pop(provider)
+        logging.debug("textEditor: {} answered for '{}' in {:.0f} ms".format(
+            provider, word, (time.perf_counter() - started) * 1000))
+        self.populateMenu(submenu, results, slot)
+
+    def providerTimedOut(self, provider, word):
+        if word != self.menuWord or provider not in self.providerMenus:
+            return
+        submenu, slot, started = self.providerMenus.pop(provider)
+        logging.debug("textEditor: {} timed out for '{}' after {:.0f} ms".format(
+            provider, word, (time.perf_counter() - started) * 1000))
+        submenu.clear()
+        submenu.addAction("Not available right now").setEnabled(False)
+
     def keyReleaseEvent(self, event):
         key = event.key()
 
@@ -240,13 +300,26 @@ class TextEdit(QTextEdit):
         if wordToCheck != "":
             self.addHelperContexts(wordToCheck)
         self.contextMenu.exec_(event.globalPos())
+        self.menuWord = None
+        self.providerMenus = {}
+
+    # Fills a submenu with the words offered by a provider, None shows a placeholder until they are known
+    def populateMenu(self, menu, words, slot):
+        menu.clear()
+        if words is None:
+            menu.addAction("Looking up...").setEnabled(False)
+            return
+        if not words:
+            menu.addAction("No suggestions").setEnabled(False)
+            return
+        for word in words:
+            action = SpecialAction(word, self.contextMenu)
+            action.actionTriggered.connect(slot)
+            menu.addAction(action)
 
     def createSuggestionsMenu(self, suggestions: list[str]):
         suggestionsMenu = QMenu("Change to", self)
-        for word in suggestions:
-            action = SpecialAction(word, self.contextMenu)
-            action.actionTriggered.connect(self.correctWord)
-            suggestionsMenu.addAction(action)
+        self.populateMenu(suggestionsMenu, suggestions, self.correctWord)
         return suggestionsMenu
 
     def createGrammarCorrectionMenu(self, suggestions: list[str]):
@@ -259,18 +332,12 @@ class TextEdit(QTextEdit):
 
     def createComplimentsMenu(self, compliments: list[str]):
         complimentsMenu = QMenu("Find complimentary word", self)
-        for word in compliments:
-            action = SpecialAction(word, self.contextMenu)
-            action.actionTriggered.connect(self.replaceWord)
-            complimentsMenu.addAction(action)
+        self.populateMenu(complimentsMenu, compliments, self.replaceWord)
         return complimentsMenu
 
     def createSynonymsMenu(self, synonym: list[str]):
         synonymMenu = QMenu("Thesaurus", self)
-        for word in synonym:
-            action = SpecialAction(word, self.contextMenu)
-            action.actionTriggered.connect(self.replaceWord)
-            synonymMenu.addAction(action)
+        self.populateMenu(synonymMenu, synonym, self.replaceWord)
         return synonymMenu
 
     def replaceSelectedWord(self, word: str):
@@ -309,8 +376,8 @@ class TextEdit(QTextEdit):
     def addToDictionary(self):
         textCursor = self.textCursor()
         new_word = textCursor.selectedText()
-        self.speller.add(new_word)
-        self.highlighter.rehighlight()
+        if self.speller.add(new_word):
+            self.highlighter.wordAdded(new_word)
 
     def canInsertFromMimeData(self, source):
 
@@ -0,0 +1,127 @@
+from collections import deque
+import time
+from typing import Callable
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+import logging
+
+import style
+from spellCheckWord import WORD_REGEX
+
+# how long the cursor must rest before we look at the paragraphs around it
+PREFETCH_DELAY = 1000
+PREFETCH_CONCURRENCY = 2
+PREFETCH_QUOTA = 30  # remote lookups a minute, well inside the service's rate limit
+QUOTA_PERIOD = 60
+MAX_QUEUED_WORDS = 200
+MAX_REMEMBERED_WORDS = 5000
+
+
+class PrefetchTask(QRunnable):
+
+    def __init__(self, prefetcher, word: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.prefetcher = prefetcher
+        self.word = word
+
+    def run(self):
+        # prefetching must never compete with the lookups the writer is waiting for
+        QThread.currentThread().setPriority(QThread.LowestPriority)
+        try:
+            self.prefetcher.prefetch(self.word)
+        except Exception as error:
+            logging.debug(
+                "thesaurusPrefetcher: prefetch of '{}' failed: {}".format(self.word, error))
+        self.prefetcher.finished.emit(self.word)
+
+
+class ThesaurusPrefetcher(QObject):
+    """
+    Warms the thesaurus cache with the content words of the paragraph under the cursor and the
+    paragraphs either side of it, so selecting one of them shows its synonyms at once.
+    Disabled until setEnabled(True) is called.
+    """
+
+    finished = pyqtSignal(str)  # emitted from the pool threads
+
+    def __init__(self, editor, prefetch: Callable[[str], object], isCached: Callable[[str], bool], parent=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.editor = editor
+        self.prefetch = prefetch
+        self.isCached = isCached
+        self.enabled = False
+        self.queue = deque()
+        self.seen = set()  # words already queued or fetched
+        self.running = {}  # word: task
+        self.started = deque()  # the start times of the lookups within the quota period
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(PREFETCH_CONCURRENCY)
+        self.cursorTimer = QTimer(self)
+        self.cursorTimer.setSingleShot(True)
+        self.cursorTimer.setInterval(PREFETCH_DELAY)
+        self.cursorTimer.timeout.connect(self.queueParagraphs)
+        self.quotaTimer = QTimer(self)
+        self.quotaTimer.setSingleShot(True)
+        self.quotaTimer.timeout.connect(self.dispatch)
+        self.finished.connect(self.taskFinished)
+        editor.cursorPositionChanged.connect(self.cursorMoved)
+
+    def setEnabled(self, enabled: bool):
+        self.enabled = enabled
+        if not enabled:
+            self.cursorTimer.stop()
+            self.quotaTimer.stop()
+            self.queue.clear()
+
+    @pyqtSlot()
+    def cursorMoved(self):
+        if self.enabled:
+            self.cursorTimer.start()
+
+    @pyqtSlot()
+    def queueParagraphs(self):
+        block = self.editor.textCursor().block()
+        # the current paragraph first, then the ones either side
+        for paragraph in (block, block.previous(), block.next()):
+            if not paragraph.isValid():
+                continue
+            for match in WORD_REGEX.finditer(paragraph.text()):
+                word = match.group().lower()
+                if word in self.seen or style.isFunctionalWord(word):
+                    continue
+                self.seen.add(word)
+                self.queue.append(word)
+        while len(self.queue) > MAX_QUEUED_WORDS:
+            self.seen.discard(self.queue.pop())
+        if len(self.seen) > MAX_REMEMBERED_WORDS:
+            self.seen = set(self.queue) | set(self.running)
+        self.dispatch()
+
+    @pyqtSlot()
+    def dispatch(self):
+        now = time.monotonic()
+        while self.started and now - self.started[0] > QUOTA_PERIOD:
+            self.started.popleft()
+        while self.enabled and self.queue and len(self.running) < PREFETCH_CONCURRENCY:
+            word = self.queue.popleft()
+            if self.isCached(word):
+                continue
+            if len(self.started) >= PREFETCH_QUOTA:
+                # out of quota, try again when the oldest lookup leaves the period
+                self.queue.appendleft(word)
+                self.quotaTimer.start(
+                    int((QUOTA_PERIOD - (now - self.started[0])) * 1000) + 1)
+                return
+            self.started.append(now)
+            task = PrefetchTask(self, word)
+            self.running[word] = task
+            self.pool.start(task, -1)
+
+    @pyqtSlot(str)
+    def taskFinished(self, word: str):
+        self.running.pop(word, None)
+        self.dispatch()
+
+    def shutdown(self):
+        self.setEnabled(False)
+        self.pool.waitForDone()
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import threading
+import time
+import logging
+import utilities
+
+# how long (milliseconds) we wait for the remote thesaurus once the local ones have answered
+REMOTE_BUDGET = 400
+REMOTE_WORKERS = 2
+
+
+class BackendStatistics:
+
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0  # lookups that found at least one synonym
+        self.late = 0  # lookups that missed the latency budget
+        self.totalTime = 0.0
+
+    def record(self, elapsed: float, found: bool):
+        self.lookups += 1
+        self.totalTime += elapsed
+        if found:
+            self.hits += 1
+
+    def summary(self) -> dict:
+        return {"lookups": self.lookups,
+                "hitRate": self.hits / self.lookups if self.lookups else 0.0,
+                "meanLatency": self.totalTime / self.lookups if self.lookups else 0.0,
+                "late": self.late}
+
+
+class ThesaurusResolver:
+    """
+    Combines several thesaurus backends behind the single suggestions(word) interface.
+    The local backends are asked first and always contribute. Remote backends are started at the same
+    time and their synonyms are merged in only if they arrive within the latency budget, a late answer
+    still completes in the background (and so warms any cache in front of the remote service).
+    """
+
+    def __init__(self, localBackends, remoteBackends, budget: int = REMOTE_BUDGET):
+        # backends are (name, thesaurus) pairs, in the order their synonyms should be listed
+        self.localBackends = list(localBackends)
+        self.remoteBackends = list(remoteBackends)
+        self.budget = budget
+        self.executor = ThreadPoolExecutor(
+            REMOTE_WORKERS, thread_name_prefix="thesaurus")
+        self.lock = threading.Lock()
+        self.statistics = {name: BackendStatistics()
+                           for name, _ in self.localBackends + self.remoteBackends}
+
+    def timedLookup(self, name: str, backend, word: str) -> list[str]:
+        start = time.perf_counter()
+        try:
+            synonyms = backend.suggestions(word)
+        except Exception as error:
+            logging.debug(
+                "thesaurusResolver: {} failed for '{}': {}".format(name, word, error))
+            synonyms = []
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.statistics[name].record(elapsed, bool(synonyms))
+        logging.debug("thesaurusResolver: {} found {} synonyms for '{}' in {:.1f} ms".format(
+            name, len(synonyms), word, elapsed * 1000))
+        return synonyms
+
+    def suggestions(self, word: str) -> list[str]:
+        if word is None:
+            return []
+        deadline = time.perf_counter() + self.budget / 1000
+        remote = [(name, self.executor.submit(self.timedLookup, name, backend, word))
+                  for name, backend in self.remoteBackends]
+        synonyms = []
+        for name, backend in self.localBackends:
+            synonyms.extend(self.timedLookup(name, backend, word))
+        for name, future in remote:
+            try:
+                synonyms.extend(future.result(
+                    max(0, deadline - time.perf_counter())))
+            except TimeoutError:
+                with self.lock:
+                    self.statistics[name].late += 1
+                logging.debug(
+                    "thesaurusResolver: {} missed the latency budget for '{}'".format(name, word))
+        # WordNet joins the words of a phrase with underscores and includes the word itself
+        synonyms = [synonym.replace("_", " ") for synonym in synonyms]
+        return [synonym for synonym in utilities.unique(synonyms) if synonym.lower() != word.lower()]
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {name: statistics.summary() for name, statistics in self.statistics.items()}
+
+    def logStatistics(self):
+        for name, summary in self.summary().items():
+            logging.info("thesaurusResolver: {}: {} lookups, {:.0%} found synonyms, {:.1f} ms mean, {} late".format(
+                name, summary["lookups"], summary["hitRate"], summary["meanLatency"] * 1000, summary["late"]))
+
+    def shutdown(self):
+        self.logStatistics()
+        self.executor.shutdown(wait=False)
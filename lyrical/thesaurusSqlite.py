@@ -1,59 +1,99 @@
-
-
-from typing import Callable
-from PyQt5.QtCore import QTemporaryFile
-from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel
-# Import necessary modules
 import os
-import sys
-from PyQt5.QtWidgets import (QApplication, QWidget, QTableView, QVBoxLayout,
-                             QMessageBox, QHeaderView)
+import sqlite3
+import threading
 import logging
+import utilities
+
+# A local thesaurus over the bundled database, for synonyms without a network connection
+THESAURUS_DATABASE = "databases/thesaurus.db"
 
 
 class ThesaurusTheo:
 
     def __init__(
-        self
+        self, resourcePath: str = "", preload: bool = False
     ):
         self.synonyms = []
-        # self.antonyms = []
-        # Create connection to database. If db file does not exist,
-        # a new db file will be created.
+        self.path = os.path.join(resourcePath, THESAURUS_DATABASE)
+        # the lookup workers share the connection
+        self.lock = threading.Lock()
+        self.connection = None
+        # headword: (synonyms, antonyms) when the whole table has been loaded into memory
+        self.entries = None
         self.create_connection()
-
-    def suggestions(self, word: str) -> list[str]:
-        self.synonyms = []
-        # self.antonyms = []
-        for syn in wn.synsets(word):
-            for l in syn.lemmas():
-                self.synonyms.append(l.name())
-                # if l.antonyms():
-                #     self.antonyms.append(l.antonyms()[0].name())
-        logging.debug("thesaurusSqlite {}".format(set(self.synonyms)))
-        # print(set(self.antonyms))
-        return self.synonyms
+        if preload:
+            self.preload()
 
     def create_connection(self):
         """
-        Set up the connection to the database.
-        Check for the tables needed.
+        Set up a read only connection to the database and check for the table we need.
         """
-        self.database = QSqlDatabase.addDatabase("QSQLITE")
-        self.database.setDatabaseName("databases/thesaurus.db")
-        if not self.database.open():
-            logging.error("Unable to open data source file.")
-            sys.exit(1)  # Error code 1 - signifies error
-        # Check if the tables we need exist in the database
-        tables_needed = {'theo'}
-        tables_not_found = tables_needed - set(self.database.tables())
-        if tables_not_found:
-            QMessageBox.critical(
-                None, 'Error', f'The following tables are missing from the database: {tables_not_found}')
-            sys.exit(1)  # Error code 1 – signifies error
-        query = QSqlQuery()
-        query.exec_("Select * from theo")
-
-# # Erase database contents so that we don't have duplicates
-# query.exec_("DROP TABLE accounts")
-# query.exec_("DROP TABLE countries")
+        try:
+            self.connection = sqlite3.connect(
+                "file:{}?mode=ro".format(self.path), uri=True, check_same_thread=False)
+            self.connection.execute("SELECT tkey FROM theo LIMIT 1")
+        except sqlite3.Error as error:
+            logging.error(
+                "thesaurusSqlite: unable to open {}: {}".format(self.path, error))
+            self.connection = None
+
+    @staticmethod
+    def split(words: str) -> list[str]:
+        # the lists are comma separated with the first word capitalised
+        result = []
+        for word in words.split(","):
+            word = word.strip()
+            if word:
+                result.append(word.lower() if word == word.capitalize() else word)
+        return result
+
+    @staticmethod
+    def keys(word: str) -> tuple[str, ...]:
+        # headwords are mostly capitalised but not consistently, asking for each form keeps the lookup on the index
+        return tuple({word.capitalize(), word.lower(), word.upper(), word.title()})
+
+    def preload(self):
+        if self.connection is None:
+            return
+        entries = {}
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT tkey, tsyn, tant FROM theo").fetchall()
+        for key, synonyms, antonyms in rows:
+            entry = entries.setdefault(key.lower(), ([], []))
+            entry[0].extend(self.split(synonyms))
+            entry[1].extend(self.split(antonyms))
+        self.entries = {key: (tuple(utilities.unique(synonyms)), tuple(utilities.unique(antonyms)))
+                        for key, (synonyms, antonyms) in entries.items()}
+        logging.debug("thesaurusSqlite: loaded {} headwords".format(
+            len(self.entries)))
+
+    def lookup(self, word: str) -> tuple[list[str], list[str]]:
+        # (synonyms, antonyms) for the word
+        if word is None:
+            return [], []
+        word = word.strip()
+        if self.entries is not None:
+            synonyms, antonyms = self.entries.get(word.lower(), ((), ()))
+            return list(synonyms), list(antonyms)
+        if self.connection is None or not word:
+            return [], []
+        keys = self.keys(word)
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT tsyn, tant FROM theo WHERE tkey IN ({})".format(
+                    ", ".join("?" * len(keys))), keys).fetchall()
+        synonyms = []
+        antonyms = []
+        for synonymList, antonymList in rows:
+            synonyms.extend(self.split(synonymList))
+            antonyms.extend(self.split(antonymList))
+        return utilities.unique(synonyms), utilities.unique(antonyms)
+
+    def suggestions(self, word: str) -> list[str]:
+        self.synonyms = self.lookup(word)[0]
+        logging.debug("thesaurusSqlite {}".format(self.synonyms))
+        return self.synonyms
+
+    def antonyms(self, word: str) -> list[str]:
+        return self.lookup(word)[1]
@@ -0,0 +1,76 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote
+import argparse
+import json
+import time
+import logging
+
+from thesaurusSqlite import ThesaurusTheo
+
+# A local stand in for the Merriam-Webster thesaurus service, answering in the same json format from
+# the bundled thesaurus database. Use it to exercise the thesaurus lookups without a network or an API key,
+# --delay and --hang make it behave like a slow or unresponsive service.
+#
+#   python thesaurusStub.py --port 8765 --delay 2
+#   LYRICAL_WEBSTER_URL=http://localhost:8765/ python lyrical.py
+
+STUB_PORT = 8765
+
+
+class ThesaurusStubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        word = unquote(urlsplit(self.path).path.rsplit("/", 1)[-1]).lower()
+        if self.server.hang:
+            time.sleep(3600)
+        time.sleep(self.server.delay)
+        body = json.dumps(self.server.entries(word)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info("thesaurusStub: " + format % args)
+
+
+class ThesaurusStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, resourcePath: str = "", delay: float = 0, hang: bool = False):
+        super().__init__(address, ThesaurusStubHandler)
+        self.thesaurus = ThesaurusTheo(resourcePath)
+        self.delay = delay
+        self.hang = hang
+
+    def entries(self, word: str) -> list:
+        synonyms = self.thesaurus.suggestions(word)
+        if not synonyms:
+            return []
+        return [{"meta": {"id": word, "syns": [synonyms]}}]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve thesaurus lookups locally in the Merriam-Webster format")
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--resources", default="",
+                        help="the directory containing the thesaurus database")
+    parser.add_argument("--delay", type=float, default=0,
+                        help="seconds to wait before answering")
+    parser.add_argument("--hang", action="store_true",
+                        help="never answer, to test timeouts")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server = ThesaurusStubServer(
+        ("localhost", arguments.port), arguments.resources, arguments.delay, arguments.hang)
+    print("Serving thesaurus lookups on http://localhost:{}/".format(arguments.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,63 +5,75 @@ import json
 import requests
 import os
 import logging
+import utilities
+
+
+# the service can be pointed at a local stub (see thesaurusStub.py) for testing
+WEBSTER_URL = os.environ.get(
+    "LYRICAL_WEBSTER_URL", "https://www.dictionaryapi.com/api/v3/references/thesaurus/json/")
+# (connect, read) seconds, a lookup must never hang the caller indefinitely
+WEBSTER_TIMEOUT = (3.05, 5)
 
 
 class ThesaurusWebster:
 
     def __init__(
-        self, APIKey
+        self, APIKey, baseUrl: str = WEBSTER_URL, timeout=WEBSTER_TIMEOUT
 
     ):
         self.synonyms = []
         self.apiKey = APIKey
+        self.baseUrl = baseUrl
+        self.timeout = timeout
         # self.antonyms = []
 
-    # Returns a unique list with any duplicates removed avoiding the reordering a set operation alone might cause
     def unique(self, sequence):
-        seen = set()
-        return [x for x in sequence if not (x in seen or seen.add(x))]
+        return utilities.unique(sequence)
 
-    def suggestions(self, word: str) -> list[str]:
+    def lookup(self, word: str) -> list[str]:
         """
-        Query Webster's Thesaurus API
+        Query Webster's Thesaurus API, raising if the service cannot be reached
         :param word: query's word
-        :return: definitions, examples, antonyms, synonyms
+        :return: synonyms
         """
         synonymsList = []
-        if word is not None:
-            api_key = self.apiKey  # os.environ.get('API_KEY')
-            word = word.lower()
-            if (api_key == "" or (api_key is None)):
-                logging.debug(
-                    "Could not locate the API Key, you will need to register with www.dictionaryapi.com")
-            url = f"https://www.dictionaryapi.com/api/v3/references/thesaurus/json/{word}?key={api_key}"
+        if word is None:
+            return synonymsList
+        api_key = self.apiKey  # os.environ.get('API_KEY')
+        word = word.lower()
+        if (api_key == "" or (api_key is None)):
+            logging.debug(
+                "Could not locate the API Key, you will need to register with www.dictionaryapi.com")
+        url = f"{self.baseUrl}{word}"
+        response = requests.get(
+            url, params={"key": api_key}, timeout=self.timeout)
+        try:
+            apiResponse = json.loads(response.text)
+        except json.JSONDecodeError as error:
+            logging.debug("Error decong json  : {}".format(error))
+            return []
+        # print(apiResponse)
+        if response.status_code == 200:
             try:
-                response = requests.get(url)
-                try:
-                    apiResponse = json.loads(response.text)
-                except json.JSONDecodeError as error:
-                    logging.debug("Error decong json  : {}".format(error))
-                    return []
-                # print(apiResponse)
-                if response.status_code == 200:
-                    try:
-                        for data in apiResponse:
-                            synonyms = ["sorry, no synonyms are available."]
-                            # print("data = " + str(data))
-                            if word in data["meta"]["id"]:
-                                try:
-                                    if len(data["meta"]["syns"]) != 0:
-                                        synonyms = data["meta"]["syns"][0]
-                                        for synonym in synonyms:
-                                            synonymsList.append(synonym)
-                                except KeyError as e:
-                                    logging.error("Key Error: ".format(e))
-                    except TypeError as e:
-                        logging.error("Type Error: ".format(e))
-
-            except SystemError as error:
-                logging.debug("Error :" + error)
-
+                for data in apiResponse:
+                    synonyms = ["sorry, no synonyms are available."]
+                    # print("data = " + str(data))
+                    if word in data["meta"]["id"]:
+                        try:
+                            if len(data["meta"]["syns"]) != 0:
+                                synonyms = data["meta"]["syns"][0]
+                                for synonym in synonyms:
+                                    synonymsList.append(synonym)
+                        except KeyError as e:
+                            logging.error("Key Error: {}".format(e))
+            except TypeError as e:
+                logging.error("Type Error: {}".format(e))
         # return list(set(synonymsList))
         return self.unique(synonymsList)
+
+    def suggestions(self, word: str) -> list[str]:
+        try:
+            return self.lookup(word)
+        except requests.RequestException as error:
+            logging.debug("thesaurusWebster: lookup failed: {}".format(error))
+            return []
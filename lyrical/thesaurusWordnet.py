@@ -1,30 +1,48 @@
-from typing import Callable
-from PyQt5.QtCore import QTemporaryFile
-from nltk.corpus import wordnet as wn
+import threading
+import wordnetIndex
+from mmapIndex import IndexFormatError
 import logging
 
 class ThesaurusWordnet:
 
     def __init__(
-        self
+        self, resourcePath: str = ""
     ):
         self.synonyms = []
+        self.resourcePath = resourcePath
+        # the precompiled index, opened on first use
+        self.index = None
+        # building a missing index needs the NLTK corpus, when that fails we stop trying
+        self.indexFailed = False
+        self.lock = threading.Lock()
         # self.antonyms = []
 
+    def openIndex(self):
+        # None when the index is missing and cannot be built
+        with self.lock:
+            if self.index is None and not self.indexFailed:
+                try:
+                    self.index = wordnetIndex.openWordnetIndex(self.resourcePath)
+                except (ImportError, LookupError, OSError, IndexFormatError) as error:
+                    self.indexFailed = True
+                    logging.error(
+                        "thesaurusWordnet: WordNet synonyms are not available: {}".format(error))
+            return self.index
+
     def suggestions(self, word: str) -> list[str]:
         self.synonyms = []
         if word is not None:
 
             logging.debug("Check Thesaurus for [" + word + "]")
-            # self.antonyms = []
-            for syn in wn.synsets(word, lang="eng"):
-                for l in syn.lemmas():
-                    self.synonyms.append(l.name())
-                    # if l.antonyms():
-                    #     self.antonyms.append(l.antonyms()[0].name())
-            logging.debug(set(self.synonyms))
-            # print(set(self.antonyms))
-        return list(set(self.synonyms))
+            index = self.openIndex()
+            if index is not None:
+                self.synonyms = index.synonyms(word)
+            logging.debug(self.synonyms)
+        return self.synonyms
+
+    def partsOfSpeech(self, word: str) -> list[str]:
+        index = self.openIndex()
+        return index.partsOfSpeech(word) if index is not None else []
 
     # def correction(self, word: str) -> str:
     #     return self.dictionary.suggest(word)[0]
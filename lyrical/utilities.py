@@ -157,6 +157,12 @@ def isNotBlank(myString):
     return bool(myString and myString.strip())
 
 
+# Returns a unique list with any duplicates removed avoiding the reordering a set operation alone might cause
+def unique(sequence):
+    seen = set()
+    return [x for x in sequence if not (x in seen or seen.add(x))]
+
+
 def attributes(obj):
     disallowed_names = {
         name for name, value in getmembers(type(obj))
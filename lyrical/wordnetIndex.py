@@ -0,0 +1,126 @@
+from array import array
+import os
+import logging
+
+from mmapIndex import MmapIndex, IndexFormatError, packStrings, writeIndex
+
+# WordNet synonyms and parts of speech exported into a memory mapped index, so looking a word up
+# does not load the NLTK corpus (several seconds) or walk its synsets.
+WORDNET_INDEX = "databases/wordnet.index"
+PART_OF_SPEECH_FLAGS = {"n": 1, "v": 2, "a": 4, "s": 8, "r": 16}
+# WordNet's detachment rules, applied when an inflected form is not in the index (as morphy does)
+MORPHOLOGICAL_SUBSTITUTIONS = (
+    ("s", ""), ("ses", "s"), ("ves", "f"), ("xes", "x"), ("zes", "z"), ("ches", "ch"), ("shes", "sh"),
+    ("men", "man"), ("ies", "y"), ("es", "e"), ("es", ""), ("ed", "e"), ("ed", ""), ("ing", "e"),
+    ("ing", ""), ("er", ""), ("est", ""),
+)
+
+
+def wordnetIndexPath(resourcePath: str = "") -> str:
+    return os.path.join(resourcePath, WORDNET_INDEX)
+
+
+def indexKey(word: str) -> str:
+    return word.strip().lower().replace(" ", "_")
+
+
+def writeWordnetIndex(target: str, synonyms: dict[str, list[str]], partsOfSpeech: dict[str, str]) -> int:
+    """
+    :param synonyms: key: the synonyms of the key, in the order they should be offered
+    :param partsOfSpeech: key: the part of speech letters (n, v, a, s, r) of the synsets the key heads
+    """
+    words = sorted(set(synonyms) | set(partsOfSpeech) |
+                   {synonym for values in synonyms.values() for synonym in values})
+    positions = {word: position for position, word in enumerate(words)}
+    # the synonyms of words[i] are words[synonymIds[synonymOffsets[i]:synonymOffsets[i + 1]]]
+    synonymOffsets = array("I", [0])
+    synonymIds = array("I")
+    flags = array("B")
+    for word in words:
+        synonymIds.extend(positions[synonym]
+                          for synonym in synonyms.get(word, ()))
+        synonymOffsets.append(len(synonymIds))
+        flags.append(sum(PART_OF_SPEECH_FLAGS[letter]
+                     for letter in set(partsOfSpeech.get(word, ""))))
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    writeIndex(target, {"lemmas": packStrings(words), "synonymOffsets": synonymOffsets.tobytes(),
+                        "synonymIds": synonymIds.tobytes(), "partsOfSpeech": flags.tobytes()})
+    logging.info("wordnetIndex: wrote {} lemmas to {}".format(len(words), target))
+    return len(words)
+
+
+def buildWordnetIndex(target: str) -> int:
+    # the only place the NLTK corpus is needed, run as part of the build
+    from nltk.corpus import wordnet as wn
+    keys = set(wn.all_lemma_names())
+    # irregular forms (geese, ran) are indexed directly, regular ones are handled by the substitutions
+    for exceptions in getattr(wn, "_exception_map", {}).values():
+        keys.update(exceptions)
+    synonyms = {}
+    partsOfSpeech = {}
+    for key in keys:
+        lemmas = []
+        letters = ""
+        for synset in wn.synsets(key):
+            lemmas.extend(lemma.name().lower() for lemma in synset.lemmas())
+            if synset.name().split(".")[0] == key:
+                letters += synset.pos()
+        seen = set()
+        synonyms[key] = [lemma for lemma in lemmas if not (
+            lemma in seen or seen.add(lemma))]
+        if letters:
+            partsOfSpeech[key] = letters
+    return writeWordnetIndex(target, synonyms, partsOfSpeech)
+
+
+def openWordnetIndex(resourcePath: str = "") -> "WordnetIndex":
+    # The build step normally provides the index, we only build it here if it is missing
+    target = wordnetIndexPath(resourcePath)
+    if not os.path.exists(target):
+        logging.warning(
+            "wordnetIndex: no index found, building {}".format(target))
+        buildWordnetIndex(target)
+    return WordnetIndex(target)
+
+
+class WordnetIndex:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index = MmapIndex(path)
+        if not self.index.hasSection("synonymIds"):
+            raise IndexFormatError("{} is not a WordNet index".format(path))
+        self.lemmas = self.index.strings("lemmas")
+        self.synonymOffsets = self.index.integers("synonymOffsets")
+        self.synonymIds = self.index.integers("synonymIds")
+        self.flags = self.index.integers("partsOfSpeech", "B")
+
+    def positions(self, word: str) -> list[int]:
+        # the entry for the word itself or, failing that, for the base forms of an inflection
+        key = indexKey(word)
+        position = self.lemmas.find(key)
+        if position >= 0:
+            return [position]
+        positions = []
+        for suffix, ending in MORPHOLOGICAL_SUBSTITUTIONS:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                position = self.lemmas.find(key[:-len(suffix)] + ending)
+                if position >= 0 and position not in positions:
+                    positions.append(position)
+        return positions
+
+    def synonyms(self, word: str) -> list[str]:
+        result = []
+        for position in self.positions(word):
+            for synonymId in self.synonymIds[self.synonymOffsets[position]:self.synonymOffsets[position + 1]]:
+                synonym = self.lemmas[synonymId]
+                if synonym not in result:
+                    result.append(synonym)
+        return result
+
+    def partsOfSpeech(self, word: str) -> list[str]:
+        # only the synsets the word itself heads, as processwords expects
+        position = self.lemmas.find(indexKey(word))
+        if position < 0:
+            return []
+        return [letter for letter, flag in PART_OF_SPEECH_FLAGS.items() if self.flags[position] & flag]
@@ -0,0 +1,14 @@
+import os
+import sys
+import pytest
+
+# the application modules import each other as top level modules from the lyrical directory
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))), "lyrical"))
+
+
+@pytest.fixture(scope="session")
+def application():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,29 @@
+import os
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+import benchmark
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lyrical")
+
+
+@pytest.fixture(scope="module")
+def context():
+    arguments = benchmark.createParser().parse_args(
+        ["--paragraphs", "3", "--words", "8", "--rows", "10", "--style-paragraphs", "2",
+         "--lint-paragraphs", "2", "--repeat", "1", "--resources", RESOURCES])
+    context = benchmark.BenchmarkContext(arguments)
+    yield context
+    for cleanup in context.cleanups:
+        cleanup()
+
+
+@pytest.mark.parametrize("name", list(benchmark.BENCHMARKS))
+def test_benchmark_runs(context, name):
+    try:
+        items, operation = benchmark.BENCHMARKS[name](context)
+    except ImportError as error:
+        pytest.skip(str(error))
+    result = benchmark.measure(name, operation, items, 1)
+    assert result["items"] == items
+    assert result["min"] >= 0
@@ -0,0 +1,60 @@
+import json
+import sys
+import threading
+import pytest
+
+import grammarCheckProject
+from languageToolStub import LanguageToolStubServer
+
+
+@pytest.fixture
+def stubServer():
+    pytest.importorskip("language_tool_python")
+    server = LanguageToolStubServer(("localhost", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://localhost:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def runCheck(monkeypatch, project, server, *options) -> tuple[int, dict]:
+    report = project / "report.json"
+    monkeypatch.setattr(sys, "argv", ["grammarCheckProject.py", str(project), "--server", server,
+                                      "--output", str(report), *options])
+    status = grammarCheckProject.main()
+    with open(report, encoding="utf-8") as f:
+        return status, json.load(f)
+
+
+def test_reports_paragraph_and_offset(monkeypatch, tmp_path, stubServer):
+    project = tmp_path / "novel"
+    project.mkdir()
+    (project / "chapter.txt").write_text("Call me Ishmael.\n\nIt was the the best of times.\n",
+                                         encoding="utf-8")
+    status, report = runCheck(monkeypatch, project, stubServer)
+    assert status == 1
+    [document] = report["files"]
+    assert document["path"] == "chapter.txt"
+    [repeat] = [match for match in document["matches"]
+                if match["ruleId"] == "ENGLISH_WORD_REPEAT_RULE"]
+    assert repeat["paragraph"] == 2
+    assert repeat["offset"] == 7
+    assert repeat["length"] == 7
+    assert repeat["text"] == "the the"
+    # the position counts the earlier paragraphs and their line breaks
+    assert repeat["position"] == len("Call me Ishmael.\n\n") + 7
+
+    # a second run answers every paragraph from the project's cache
+    status, again = runCheck(monkeypatch, project, stubServer)
+    assert again["cached"] == again["paragraphs"] == 2
+    assert again["files"] == report["files"]
+
+
+def test_clean_project(monkeypatch, tmp_path, stubServer):
+    project = tmp_path / "novel"
+    project.mkdir()
+    (project / "chapter.html").write_text("<p>It was the best of times.</p>", encoding="utf-8")
+    status, report = runCheck(monkeypatch, project, stubServer, "--no-cache")
+    assert status == 0
+    assert report["matches"] == 0
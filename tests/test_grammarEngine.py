@@ -0,0 +1,59 @@
+import pytest
+
+from grammarEngine import GrammarEngine
+
+
+class FakeServer:
+
+    def __init__(self, up: bool):
+        self.up = up
+        self.starts = 0
+        self.restartsFromRequests = 0
+
+
+class FakeLocalTool:
+    # behaves like language_tool_python 2.7, which restarts a local server from the request that failed
+
+    def __init__(self, server: FakeServer):
+        self._remote = False
+        self._server = server
+        self.process = server
+
+    def check(self, text: str) -> list:
+        if not self.process.up:
+            if self._remote is False:
+                self.process.restartsFromRequests += 1
+            raise OSError("connection refused")
+        return []
+
+    def _terminate_server(self):
+        self.process.up = False
+
+    def _start_local_server(self):
+        self.process.up = True
+        self.process.starts += 1
+
+
+def paragraphs(count: int) -> list:
+    return [(number, "Paragraph number {}.".format(number)) for number in range(count)]
+
+
+def test_workers_restart_a_failed_local_server_once():
+    server = FakeServer(up=False)
+    tool = FakeLocalTool(server)
+    engine = GrammarEngine([tool], workers=4, batchCharacters=30)
+    found = [key for unit in engine.check(paragraphs(12)) for key, _ in unit]
+    engine.shutdown()
+    assert found == list(range(12))
+    assert server.starts == 1
+    assert server.restartsFromRequests == 0
+    assert tool._remote is False and tool._server is server
+
+
+def test_remote_server_errors_are_raised():
+    tool = FakeLocalTool(FakeServer(up=False))
+    tool._remote = True
+    engine = GrammarEngine([tool], workers=2)
+    with pytest.raises(OSError):
+        list(engine.check(paragraphs(2)))
+    engine.shutdown()
@@ -0,0 +1,33 @@
+import threading
+import time
+
+
+class SlowSpeller:
+    # enough of SpellCheckWord for the worker, each check takes a while so checks queue up
+
+    def __init__(self):
+        self.generation = 0
+        self.checks = 0
+        self.lock = threading.Lock()
+
+    def misspelledRanges(self, text, language=None):
+        time.sleep(0.01)
+        with self.lock:
+            self.checks += 1
+        return []
+
+
+def test_shutdown_stops_the_spell_check_thread(application):
+    from PyQt5.QtGui import QTextDocument
+    from highlighter import Highlighter
+    document = QTextDocument()
+    highlighter = Highlighter(document)
+    speller = SlowSpeller()
+    highlighter.setSpeller(speller)
+    document.setPlainText("\n".join("paragraph number {}".format(number) for number in range(200)))
+    highlighter.rehighlight()
+    assert highlighter.pendingChecks
+    highlighter.shutdown()
+    assert not highlighter._thread.isRunning()
+    # the checks still queued were dropped rather than run
+    assert speller.checks < 200
@@ -0,0 +1,53 @@
+import pytest
+
+import manuscript
+
+# html as QTextEdit.toHtml writes it: an empty paragraph, a line break and pre-wrap whitespace
+QT_HTML = """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">
+<html><head><meta name="qrichtext" content="1" /><style type="text/css">
+p, li { white-space: pre-wrap; }
+</style></head><body style=" font-family:'Sans Serif'; font-size:10pt; font-weight:400; font-style:normal;">
+<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;">First paragraph teh.</p>
+<p style="-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;"><br /></p>
+<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;">Third  line<br />same <span style=" font-weight:600;">block</span></p></body></html>"""
+
+# hand written html whose layout whitespace collapses
+PLAIN_HTML = """<html><body>
+  <p>Hello   <b>big</b>
+  world </p>
+  <p></p>
+  <div><p>x&nbsp; y</p></div>
+  <h1>Chapter  two</h1>
+</body></html>"""
+
+# whitespace between blocks, line breaks and preformatted text
+MIXED_HTML = """<h1>Title</h1>\n\n<p>one <i>two</i> </p>\n<p> three<br> four</p>
+<ul>\n  <li>item</li>\n  <li>item</li>\n</ul><pre>line\n  indented</pre>tail"""
+
+TABLE_HTML = """<table>\n <tr>\n  <td>cell</td>\n  <td>cell</td>\n </tr>\n</table>\n\n<p>after</p>"""
+
+
+def qtBlocks(html: str) -> list[str]:
+    from PyQt5.QtGui import QTextDocument
+    document = QTextDocument()
+    document.setHtml(html)
+    blocks = []
+    block = document.begin()
+    while block.isValid():
+        blocks.append(block.text())
+        block = block.next()
+    return blocks
+
+
+def test_qt_html_blocks():
+    assert manuscript.textBlocks(QT_HTML) == [
+        "First paragraph teh.", "", "Third  line\u2028same block"]
+
+
+@pytest.mark.parametrize("html", [QT_HTML, PLAIN_HTML, MIXED_HTML, TABLE_HTML])
+def test_blocks_match_qtextdocument(application, html):
+    assert manuscript.textBlocks(html) == qtBlocks(html)
+
+
+def test_plain_text_keeps_empty_lines():
+    assert manuscript.textBlocks("one\n\nthree") == ["one", "", "three"]
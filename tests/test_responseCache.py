@@ -0,0 +1,34 @@
+import responseCache
+from responseCache import ResponseCache
+
+
+def test_frequently_read_key_survives_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(responseCache, "EVICTION_INTERVAL", 1)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), maxEntries=3)
+    for key in ("often", "once", "never"):
+        cache.put(key, [key])
+    cache.get("once")
+    # these reads are answered from the memory tier
+    for _ in range(5):
+        assert cache.get("often") == (["often"], True)
+    cache.put("new", ["new"])
+    cache.close()
+
+    reopened = ResponseCache(str(tmp_path / "cache.sqlite"), maxEntries=3)
+    assert reopened.get("often") == (["often"], True)
+    assert reopened.get("once") == (["once"], True)
+    assert reopened.get("never") is None
+    reopened.close()
+
+
+def test_memory_hits_are_kept_when_closing(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    cache.put("word", ["synonym"])
+    cache.get("word")
+    used = cache.used["word"]
+    cache.close()
+    reopened = ResponseCache(path)
+    assert reopened.connection.execute(
+        "SELECT used FROM entries WHERE key = ?", ("word",)).fetchone()[0] == used
+    reopened.close()
@@ -0,0 +1,52 @@
+import time
+
+from responseCache import ResponseCache, CachedThesaurus
+from thesaurusResolver import ThesaurusResolver
+
+
+class LocalThesaurus:
+
+    def __init__(self, synonyms):
+        self.synonyms = synonyms
+
+    def suggestions(self, word):
+        return list(self.synonyms)
+
+
+class SlowService:
+    # stands in for Webster, lookup(word) is what CachedThesaurus calls
+
+    def __init__(self, synonyms, delay):
+        self.synonyms = synonyms
+        self.delay = delay
+
+    def lookup(self, word):
+        time.sleep(self.delay)
+        return list(self.synonyms)
+
+
+def test_remote_answer_within_the_budget_is_merged(tmp_path):
+    cache = ResponseCache(str(tmp_path / "thesaurus.sqlite"))
+    resolver = ThesaurusResolver([("local", LocalThesaurus(["large"]))],
+                                 [("remote", CachedThesaurus(SlowService(["huge"], 0), cache))], budget=2000)
+    assert resolver.suggestions("big") == ["large", "huge"]
+    resolver.shutdown()
+    cache.close()
+
+
+def test_late_remote_answer_is_dropped_but_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / "thesaurus.sqlite"))
+    resolver = ThesaurusResolver([("local", LocalThesaurus(["large"]))],
+                                 [("remote", CachedThesaurus(SlowService(["huge"], 0.3), cache))], budget=50)
+    start = time.perf_counter()
+    assert resolver.suggestions("big") == ["large"]
+    assert time.perf_counter() - start < 0.25
+    assert resolver.summary()["remote"]["late"] == 1
+    # the late answer still completes and warms the cache, so the next lookup has it in time
+    deadline = time.monotonic() + 5
+    while cache.get("big") is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert cache.get("big") == (["huge"], True)
+    assert resolver.suggestions("big") == ["large", "huge"]
+    resolver.shutdown()
+    cache.close()
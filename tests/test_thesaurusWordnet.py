@@ -0,0 +1,31 @@
+import logging
+
+import wordnetIndex
+from thesaurusWordnet import ThesaurusWordnet
+
+
+def test_missing_index_is_only_built_once(tmp_path, monkeypatch, caplog):
+    builds = []
+
+    def buildWithoutCorpus(target):
+        builds.append(target)
+        raise LookupError("Resource wordnet not found")
+
+    monkeypatch.setattr(wordnetIndex, "buildWordnetIndex", buildWithoutCorpus)
+    thesaurus = ThesaurusWordnet(str(tmp_path))
+    with caplog.at_level(logging.ERROR):
+        assert thesaurus.suggestions("happy") == []
+        assert thesaurus.suggestions("sad") == []
+        assert thesaurus.partsOfSpeech("happy") == []
+    assert builds == [wordnetIndex.wordnetIndexPath(str(tmp_path))]
+    assert len([record for record in caplog.records if record.levelno == logging.ERROR]) == 1
+
+
+def test_index_is_opened_from_the_resource_path(tmp_path):
+    wordnetIndex.writeWordnetIndex(wordnetIndex.wordnetIndexPath(str(tmp_path)),
+                                   {"happy": ["happy", "glad"], "glad": ["glad", "happy"]},
+                                   {"happy": "a", "glad": "a"})
+    thesaurus = ThesaurusWordnet(str(tmp_path))
+    assert thesaurus.index is None
+    assert thesaurus.suggestions("happy") == ["happy", "glad"]
+    assert thesaurus.partsOfSpeech("glad") == ["a"]